@@ -2,10 +2,13 @@ import tkinter as tk  # 导入tkinter库，用于创建GUI界面
 import random         # 导入random库，用于随机选择提示语和颜色
 import time           # 导入time库，用于控制窗口创建的间隔时间
 
-def create_tip_window(main_window, tips, bg_colors, windows_list, final_window_created):
+from effects.popups import TipWindowPool  # 可复用的提示窗口池
+
+def create_tip_window(main_window, pool, tips, bg_colors, windows_list, final_window_created):
     """
-    创建一个提示窗口，并设置自动关闭
+    弹出一个提示窗口（取自窗口池），并设置自动关闭
     :param main_window: 主窗口对象
+    :param pool: 提示窗口池（TipWindowPool），关闭的窗口隐藏后收回复用
     :param tips: 提示语列表
     :param bg_colors: 背景颜色列表
     :param windows_list: 存储所有窗口的列表
@@ -15,36 +18,19 @@ def create_tip_window(main_window, tips, bg_colors, windows_list, final_window_c
     if final_window_created[0]:
         return
     
-    # 设置窗口的宽和高
-    window_width = 300
-    window_height = 90
-    
     # 随机生成窗口在屏幕上的位置（x, y坐标）
     x = random.randint(-30, 1500)
     y = random.randint(-20, 900)
 
-    # 创建顶级窗口（Toplevel）
-    window = tk.Toplevel(main_window)
-    window.title('温馨提示')  # 设置窗口标题
-    # 设置窗口大小和位置
-    window.geometry(f"{window_width}x{window_height}+{x}+{y}")
-    # 确保窗口始终显示在最上层
-    window.attributes('-topmost', True)
-
     # 从提示语列表中随机选择一条提示语
     tip = random.choice(tips)
     # 从颜色列表中随机选择一种背景色
     bg = random.choice(bg_colors)
 
-    # 创建标签组件，用于显示提示语
-    tk.Label(
-        window,               # 父窗口
-        text=tip,             # 显示的文本内容
-        bg=bg,                # 背景颜色
-        font=('微软雅黑', 16), # 字体设置
-        width=30,             # 宽度
-        height=3              # 高度
-    ).pack()  # 将标签添加到窗口中
+    # 从窗口池取出一个窗口，换上提示语、背景色和位置后显示（池中窗口都在显示时不再弹出）
+    window = pool.show(tip, bg, x, y)
+    if window is None:
+        return
 
     # 将窗口添加到列表
     windows_list.append(window)
@@ -52,18 +38,17 @@ def create_tip_window(main_window, tips, bg_colors, windows_list, final_window_c
     # 设置窗口在随机时间后自动关闭（1-3秒）
     close_delay = random.randint(1000, 3000)
     def close_window():
-        if window.winfo_exists():
-            window.destroy()
-        # 从列表中移除已关闭的窗口
+        # 隐藏窗口并收回窗口池，从列表中移除
         if window in windows_list:
             windows_list.remove(window)
+            pool.hide(window)
             
         # 当所有窗口都关闭且未创建最终窗口时，创建最终窗口
-        if not windows.winfo_exists() and not windows_list and not final_window_created[0]:
+        if not windows_list and not final_window_created[0]:
             final_window_created[0] = True
             create_final_window(main_window)
     
-    window.after(close_delay, close_window)
+    main_window.after(close_delay, close_window)
     return window
 
 def create_final_window(main_window):
@@ -125,11 +110,15 @@ def main():
     # 控制创建窗口的数量
     max_windows = 50
     current_window_count = [0]  # 使用列表是为了在嵌套函数中修改
+    # 同时显示的窗口数上限：每 0.01 秒弹出一个、每个显示 1~3 秒，同时最多 3000 // 10 个，也不会超过窗口总数
+    max_simultaneous_windows = min(max_windows, 3000 // 10)
+    # 窗口池在需要时才新建窗口（不预先建满），关闭的窗口隐藏后收回，留给之后的提示复用
+    pool = TipWindowPool(main_window, max_simultaneous_windows)
     
     # 循环创建窗口的函数
     def create_windows():
         if current_window_count[0] < max_windows and not final_window_created[0]:
-            create_tip_window(main_window, tips, bg_colors, windows_list, final_window_created)
+            create_tip_window(main_window, pool, tips, bg_colors, windows_list, final_window_created)
             current_window_count[0] += 1
             # 每0.01秒创建一个新窗口
             main_window.after(10, create_windows)
@@ -0,0 +1,88 @@
+"""
+集中爆炸时的帧耗时基准（无窗口，SDL dummy 驱动）
+每隔 INTERVAL 帧同时发射 BURST 个烟花，统计全部帧和发生爆炸的帧的耗时分布。
+pooled  ：FireworkPool + 预分配容量的 ParticleSystem（现实现）
+unpooled：每次新建 Firework 对象，ParticleSystem 从很小的容量开始按需扩容
+用法：python bench/burst.py [帧数] [每批烟花数]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame  # noqa: E402
+
+import effects.firework_engine as fe  # noqa: E402
+from effects.rng_streams import RandomStreams  # noqa: E402
+from stats import percentile  # noqa: E402
+
+WIDTH, HEIGHT = 1280, 720
+INTERVAL = 60
+
+
+def run(pooled, frames, burst, win):
+    streams = RandomStreams(0)
+    rng = streams.stream('fireworks')
+    if pooled:
+        system = fe.ParticleSystem(seed=streams.generator('particles'))
+        pool = fe.FireworkPool(system, WIDTH, HEIGHT, size=burst * 2, rng=rng)
+        launch = pool.acquire
+    else:
+        system = fe.ParticleSystem(capacity=16, seed=streams.generator('particles'))
+        pool = None
+        launch = lambda: fe.Firework(system, WIDTH, HEIGHT, rng=rng)  # noqa: E731
+    fireworks = []
+    samples = {'all': [], 'burst': [], 'sim': [], 'sim-burst': []}
+    for frame in range(frames):
+        start = time.perf_counter()
+        win.fill((0, 0, 20))
+        if frame % INTERVAL == 0:
+            for _ in range(burst):
+                fireworks.append(launch())
+        rising = sum(1 for fw in fireworks if not fw.exploded)
+        # 与 update_fireworks 相同的步骤，单独计出不含粒子绘制的模拟耗时
+        sim_start = time.perf_counter()
+        for fw in fireworks:
+            fw.update(win)
+        system.update()
+        sim = time.perf_counter() - sim_start
+        system.show(win)
+        sim_start = time.perf_counter()
+        kept = 0
+        for fw in fireworks:
+            if not fw.remove():
+                fireworks[kept] = fw
+                kept += 1
+            elif pool is not None:
+                pool.release(fw)
+        del fireworks[kept:]
+        sim = (sim + time.perf_counter() - sim_start) * 1000
+        elapsed = (time.perf_counter() - start) * 1000
+        exploded = rising - sum(1 for fw in fireworks if not fw.exploded)
+        samples['all'].append(elapsed)
+        samples['sim'].append(sim)
+        if exploded:
+            samples['burst'].append(elapsed)
+            samples['sim-burst'].append(sim)
+    return samples
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    burst = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    pygame.init()
+    win = pygame.display.set_mode((WIDTH, HEIGHT))
+    print('all / burst：整帧（含绘制）；sim / sim-burst：只计烟花弹、粒子更新与回收')
+    print(f"{'mode':<9} {'frames':<10} {'mean':>7} {'p50':>7} {'p99':>7} {'max':>7}  (ms)")
+    for pooled in (False, True):
+        name = 'pooled' if pooled else 'unpooled'
+        for label, values in run(pooled, frames, burst, win).items():
+            print(f"{name:<9} {label:<10} {sum(values) / len(values):>7.3f} {percentile(values, 50):>7.3f} "
+                  f"{percentile(values, 99):>7.3f} {max(values):>7.3f}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+心形帧存储的内存占用（无窗口）
+按 dad.py / ceshi.py 的参数（800 个原始点，帧以心形中心为原点、与分辨率无关）预计算 generate_frame 帧，
+报告帧数据本身的字节数、每点字节数和进程常驻内存（ru_maxrss，减去只导入模块时的基线）。
+每个帧数在独立子进程中运行，互不干扰；不使用磁盘缓存。
+用法：python bench/heart_memory.py [帧数列表，默认 30,120,300]
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def frames_nbytes(frames):
+    """帧数据占用的字节数：紧凑存储时为整块数据加偏移表，否则为各帧数组之和"""
+    if hasattr(frames, 'nbytes'):
+        return frames.nbytes
+    return sum(frame.nbytes for frame in frames)
+
+
+def measure(generate_frame):
+    sys.path.insert(0, ROOT)
+    from effects.heart_engine import HeartEngine, precompute_frames
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    engine = HeartEngine(0, 0, 11, seed=1314)
+    frames = precompute_frames(engine, 800, generate_frame)
+    elapsed = time.perf_counter() - start
+    points = sum(len(frames[i]) for i in range(generate_frame))
+    nbytes = frames_nbytes(frames)
+    return dict(frames=generate_frame, points=points, frame_bytes=nbytes,
+                bytes_per_point=round(nbytes / points, 2),
+                rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline,
+                seconds=round(elapsed, 2))
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--case':
+        print(json.dumps(measure(int(sys.argv[2]))))
+        return
+    counts = sys.argv[1] if len(sys.argv) > 1 else '30,120,300'
+    print(f"{'frames':>6} {'points':>10} {'frame MB':>9} {'B/point':>8} {'RSS MB':>7} {'time(s)':>8}")
+    for count in counts.split(','):
+        child = subprocess.run([sys.executable, os.path.abspath(__file__), '--case', count],
+                               capture_output=True, text=True, check=True)
+        r = json.loads(child.stdout.strip().splitlines()[-1])
+        print(f"{r['frames']:>6} {r['points']:>10,} {r['frame_bytes'] / 2 ** 20:>9.1f} "
+              f"{r['bytes_per_point']:>8} {r['rss_kb'] / 1024:>7.1f} {r['seconds']:>8}")
+
+
+if __name__ == '__main__':
+    main()
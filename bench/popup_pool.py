@@ -0,0 +1,78 @@
+"""
+提示窗口的创建延迟和 CPU 占用（需要图形界面）
+create：每条提示新建 Toplevel + Label，关闭时 destroy（原始方式）
+pool  ：TipWindowPool 预先建好窗口，弹出时改文字、颜色、位置后 deiconify，关闭时 withdraw
+每条提示弹出后立即让 Tk 处理完事件（update），记录从弹出到显示完成的耗时；
+同时保持 VISIBLE 个窗口，超出时关闭最早的一个，统计总耗时中的进程 CPU 时间。
+用法：python bench/popup_pool.py [提示条数]
+"""
+import os
+import random
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from effects.popups import BG_COLORS, TIPS, WINDOW_HEIGHT, WINDOW_WIDTH, TipWindowPool  # noqa: E402
+from stats import percentile  # noqa: E402
+
+VISIBLE = 8
+
+
+class CreateDestroy:
+    def __init__(self, root):
+        self.root = root
+
+    def show(self, text, bg, x, y):
+        window = tk.Toplevel(self.root)
+        window.title('温馨提示')
+        window.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}+{x}+{y}")
+        window.attributes('-topmost', True)
+        tk.Label(window, text=text, bg=bg, font=('微软雅黑', 16), width=30, height=3).pack()
+        return window
+
+    def hide(self, window):
+        window.destroy()
+
+
+def run(mode, count):
+    rng = random.Random(0)
+    root = tk.Tk()
+    root.withdraw()
+    setup = time.perf_counter()
+    popups = TipWindowPool(root, VISIBLE, prefill=True) if mode == 'pool' else CreateDestroy(root)
+    root.update()
+    setup_ms = (time.perf_counter() - setup) * 1000
+
+    shown = []
+    latency = []
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(count):
+        if len(shown) >= VISIBLE:
+            popups.hide(shown.pop(0))
+        start = time.perf_counter()
+        shown.append(popups.show(rng.choice(TIPS), rng.choice(BG_COLORS),
+                                 rng.randint(0, 1500), rng.randint(0, 900)))
+        root.update()
+        latency.append((time.perf_counter() - start) * 1000)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    root.destroy()
+    return setup_ms, latency, wall, cpu
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    print(f"{'mode':<7} {'setup(ms)':>10} {'mean':>8} {'p50':>8} {'p99':>8} {'cpu(%)':>7}")
+    for mode in ('create', 'pool'):
+        try:
+            setup_ms, latency, wall, cpu = run(mode, count)
+        except tk.TclError as e:
+            print(f"无法创建 Tk 窗口（需要图形界面）: {e}")
+            return
+        print(f"{mode:<7} {setup_ms:>10.1f} {sum(latency) / len(latency):>8.2f} {percentile(latency, 50):>8.2f} "
+              f"{percentile(latency, 99):>8.2f} {cpu / wall * 100:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
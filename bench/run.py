@@ -0,0 +1,261 @@
+"""
+无窗口、可复现的特效基准测试
+使用 SDL 的 dummy 视频驱动和固定随机种子，按场景 × 分辨率 × 粒子密度（每次爆炸的粒子数倍率）逐一运行 N 帧，
+输出每帧耗时的 mean / p50 / p99 和峰值内存（JSON），便于在普通 Linux 机器上对比不同提交。
+每个用例在独立子进程中运行，峰值内存（ru_maxrss）互不干扰。
+加 --dirty 时使用脏矩形刷新，并报告每帧刷新面积占比和整屏刷新的帧数；
+烟花默认用圆点精灵批量绘制（与各场景一致），加 --no-sprites 时逐个 draw.circle；
+--trails fade 时用渐隐层拖尾代替每个粒子 5 个拖尾圆点；
+默认提前移除落出屏幕的粒子（与各场景一致），加 --no-cull 关闭；屏幕外的粒子圆点总是跳过不画。
+心形按 surface 方式整帧 blit，画面外的部分由 blit 裁掉，--no-cull 对心形没有影响
+（逐点剔除只在 'rect' 绘制方式下起作用）。结果中报告各帧落在画面外的心形点数（heart_culled，
+不计入帧耗时）、跳过的粒子绘制数和提前移除的粒子数。
+--scale 0.5 时在一半分辨率的内部画布上作画，每帧放大到窗口（与各场景的 RENDER_SCALE 一致）。
+--popup-process 时 popups 场景的弹窗在独立进程中运行（effects.popups.PopupProcess），主循环只发消息。
+
+场景（与 ceshi.py 的主循环节奏一致）：
+  heart     只有心形
+  fireworks 只有烟花
+  mode3     心形 + 烟花（display_mode 3）
+  popups    mode3 + tkinter 提示弹窗（effects.popups.TipPopups，与 ceshi.py 的 'tk' 模式相同；
+            需要图形界面，否则记为 skipped）
+  tips      mode3 + 上千个虚拟提示框（effects.tip_overlay.VirtualTips，画在同一画面上）
+
+用法：python bench/run.py [--frames 300] [--resolutions 1280x720,1920x1080]
+                          [--densities 0.5,1,2] [--scenes heart,fireworks,mode3,popups,tips]
+                          [--seed 0] [--dirty] [--no-sprites] [--trails circles|fade] [--no-cull] [--scale 1]
+                          [--popup-process]
+                          [--output result.json]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from importlib import metadata
+
+from stats import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENES = ('heart', 'fireworks', 'mode3', 'popups', 'tips')
+
+# 与 ceshi.py 相同的节奏参数
+HEART_FRAME_SKIP = 3
+HEART_FRAMES = 30
+HEART_POINTS = 800
+IMAGE_ENLARGE = 11
+HEART_COLOR = (255, 105, 180)
+LAUNCH_CHANCE = 11  # 每帧 1/11 的概率发射新烟花
+INITIAL_FIREWORKS = 5
+TIP_INTERVAL = 200  # 弹窗间隔（毫秒）
+MAX_TIPS = 8
+VIRTUAL_TIP_BURST = 8  # tips 场景每帧弹出的提示数（显示 1~3 秒，同时约 900 个）
+
+
+def scaled_style(density):
+    """按密度缩放每次爆炸的粒子数"""
+    import effects.firework_engine as fe
+    style = dict(fe.DEFAULT_STYLE)
+    low, high = style['particles']
+    style['particles'] = (max(1, round(low * density)), max(1, round(high * density)))
+    return style
+
+
+def run_case(case):
+    """在当前进程中运行一个用例，返回结果字典"""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    sys.path.insert(0, ROOT)
+    import pygame
+    import effects.firework_engine as fe
+    from effects.heart import HeartLayer
+    from effects.dirty_rects import DirtyRegion
+    from effects.circle_sprites import CircleSprites
+    from effects.rng_streams import RandomStreams
+    from effects.display import ScaledScreen
+
+    scene, width, height = case['scene'], case['width'], case['height']
+    density, seed, frames = case['density'], case['seed'], case['frames']
+    streams = RandomStreams(seed)  # 与 ceshi.py 相同的各子系统随机数流
+    launch_rng = streams.stream('launch')
+    pygame.init()
+    popup_size = (width, height)  # 弹窗按窗口坐标摆放，其余按内部画布坐标
+    scaled = ScaledScreen(pygame.display.set_mode((width, height)), case.get('scale', 1.0))
+    screen, (width, height) = scaled.surface, scaled.size
+    dirty = DirtyRegion((width, height), case.get('dirty', False), present=scaled.present)
+    viewport = (width, height) if case.get('cull', True) else None
+    with_heart = scene in ('heart', 'mode3', 'popups', 'tips')
+    with_fireworks = scene in ('fireworks', 'mode3', 'popups', 'tips')
+
+    setup_start = time.perf_counter()
+    popups = None
+    if scene == 'tips':
+        from effects.tip_overlay import VirtualTips
+        popups = VirtualTips((width, height), streams.stream('popups'), interval=0, max_total=10 ** 9,
+                             max_visible=10 ** 5, burst=VIRTUAL_TIP_BURST)
+    if scene == 'popups':
+        try:
+            import tkinter
+            # 子进程和 TipPopups 里的失败只会打印出来，先在这里确认有图形界面
+            tkinter.Tk().destroy()
+            from effects.popups import PopupProcess, TipPopups
+            popup_class = PopupProcess if case.get('popup_process') else TipPopups
+            popups = popup_class(popup_size, streams.stream('popups'), interval=TIP_INTERVAL,
+                                 max_total=10 ** 9, max_visible=MAX_TIPS)
+        except Exception as e:  # 没有图形界面时 tkinter 无法创建窗口
+            pygame.quit()
+            return dict(case, skipped=f"{type(e).__name__}: {e}")
+    if with_heart:
+        heart = HeartLayer(HEART_COLOR, IMAGE_ENLARGE, seed, HEART_POINTS, HEART_FRAMES, HEART_FRAME_SKIP,
+                           cache=False, stream=False, culling=case.get('cull', True), scale=scaled.scale)
+    if with_fireworks:
+        style = scaled_style(density)
+        system = fe.ParticleSystem(seed=streams.generator('particles'), sprites=CircleSprites() if case.get('sprites', True) else None,
+                                   fade=fe.FadeTrails() if case.get('trails') == 'fade' else None,
+                                   viewport=viewport)
+        pool = fe.FireworkPool(system, width, height, style, rng=streams.stream('fireworks'))
+        fireworks = [pool.acquire() for _ in range(INITIAL_FIREWORKS)]
+    setup_ms = (time.perf_counter() - setup_start) * 1000
+
+    times = []
+    coverage = []
+    particles = 0
+    tips = 0
+    culled_draws = 0
+    for frame in range(frames):
+        start = time.perf_counter()
+        dirty.clear(screen, (0, 0, 20))
+        if popups is not None:
+            popups.step(frame * 1000 // 60)  # 按 60 帧/秒 的虚拟时钟调度
+        if with_heart:
+            dirty.add_rect(heart.draw(screen))
+        if with_fireworks:
+            if launch_rng.randint(0, LAUNCH_CHANCE - 1) == 1:
+                fireworks.append(pool.acquire())
+            fe.update_fireworks(screen, fireworks, system, pool, dirty)
+            particles = max(particles, system.count)
+            culled_draws += system.culled
+        if scene == 'tips':
+            popups.draw(screen, dirty)
+            tips = max(tips, len(popups.active))
+        if popups is not None:
+            popups.update()  # 驱动 Tk 事件（与 ceshi.py 主循环的 'tk' 阶段相同）
+        dirty.update()
+        coverage.append(dirty.coverage)
+        times.append((time.perf_counter() - start) * 1000)
+    if popups is not None:
+        popups.close()
+    heart_culled = 0
+    if with_heart:
+        for i in range(HEART_FRAMES):  # 各帧中完全落在画面外的点数之和（不计入帧耗时）
+            heart.render(screen, i)
+            heart_culled += heart.culled
+    pygame.quit()
+
+    return dict(
+        case,
+        setup_ms=round(setup_ms, 3),
+        mean_ms=round(sum(times) / len(times), 3),
+        p50_ms=round(percentile(times, 50), 3),
+        p99_ms=round(percentile(times, 99), 3),
+        max_ms=round(max(times), 3),
+        peak_particles=particles,
+        peak_tips=tips,
+        heart_culled=heart_culled,
+        culled_draws=culled_draws,
+        retired_offscreen=system.retired_offscreen if with_fireworks else 0,
+        mean_coverage=round(sum(coverage) / len(coverage), 4),
+        full_updates=dirty.full_updates if dirty.enabled else len(times),
+        peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    )
+
+
+def package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='无窗口特效基准测试')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--resolutions', default='1280x720,1920x1080,3840x2160')
+    parser.add_argument('--densities', default='0.5,1,2')
+    parser.add_argument('--scenes', default=','.join(SCENES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--dirty', action='store_true', help='使用脏矩形刷新')
+    parser.add_argument('--no-sprites', dest='sprites', action='store_false', help='烟花逐个 draw.circle')
+    parser.add_argument('--trails', choices=('circles', 'fade'), default='circles', help='粒子拖尾的画法')
+    parser.add_argument('--no-cull', dest='cull', action='store_false', help='不提前移除落出屏幕的粒子（心形总是整帧 blit，不受影响）')
+    parser.add_argument('--scale', type=float, default=1.0, help='内部渲染分辨率与窗口分辨率之比')
+    parser.add_argument('--popup-process', action='store_true', help='弹窗在独立进程中运行')
+    parser.add_argument('--output', help='结果 JSON 文件（默认输出到标准输出）')
+    parser.add_argument('--case', help=argparse.SUPPRESS)  # 子进程内部使用
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(json.loads(args.case))))
+        return
+
+    results = []
+    for scene in args.scenes.split(','):
+        for resolution in args.resolutions.split(','):
+            width, height = (int(v) for v in resolution.split('x'))
+            # 密度只影响烟花，纯心形场景只跑一次
+            densities = [1.0] if scene == 'heart' else [float(d) for d in args.densities.split(',')]
+            for density in densities:
+                case = dict(scene=scene, width=width, height=height, density=density,
+                            seed=args.seed, frames=args.frames, dirty=args.dirty,
+                            sprites=args.sprites, trails=args.trails, cull=args.cull,
+                            scale=args.scale, popup_process=args.popup_process)
+                child = subprocess.run([sys.executable, os.path.abspath(__file__), '--case', json.dumps(case)],
+                                       capture_output=True, text=True)
+                if child.returncode != 0:
+                    result = dict(case, error=child.stderr.strip().splitlines()[-1:])
+                else:
+                    result = json.loads(child.stdout.strip().splitlines()[-1])
+                results.append(result)
+                print(f"{scene:<9} {resolution:>9} x{density:<4} "
+                      + (f"mean {result['mean_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms"
+                         if 'mean_ms' in result else result.get('skipped') or str(result.get('error'))),
+                      file=sys.stderr)
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': package_version('numpy'),
+        'pygame': package_version('pygame'),
+        'platform': platform.platform(),
+        'frames': args.frames,
+        'seed': args.seed,
+        'dirty': args.dirty,
+        'sprites': args.sprites,
+        'trails': args.trails,
+        'cull': args.cull,
+        'scale': args.scale,
+        'popup_process': args.popup_process,
+        'results': results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
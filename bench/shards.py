@@ -0,0 +1,79 @@
+"""
+多进程烟花粒子模拟的吞吐量（无窗口，SDL dummy 驱动）
+同一场高密度烟花分别用单进程 ParticleSystem（workers=0）和 1、2、4……个分片进程的
+ShardedParticleSystem 运行，报告每帧模拟耗时（system.update，含进程间同步）、整帧耗时
+和每秒模拟的粒子数，并列出本机的 CPU 核心数以便对照。
+用法：python bench/shards.py [帧数] [最大进程数]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame  # noqa: E402
+
+import effects.firework_engine as fe  # noqa: E402
+from effects.particle_shards import ShardedParticleSystem  # noqa: E402
+from effects.rng_streams import RandomStreams  # noqa: E402
+
+WIDTH, HEIGHT = 1280, 720
+LAUNCH_CHANCE = 3  # 每帧 1/3 的概率发射
+DENSITY = 4  # 每次爆炸的粒子数倍率
+
+
+def run(workers, frames, win):
+    streams = RandomStreams(0)
+    style = dict(fe.DEFAULT_STYLE)
+    style['particles'] = tuple(n * DENSITY for n in style['particles'])
+    if workers:
+        system = ShardedParticleSystem(workers, capacity=fe.DEFAULT_CAPACITY * 4,
+                                       seed=streams.generator('particles'), viewport=(WIDTH, HEIGHT))
+    else:
+        system = fe.ParticleSystem(seed=streams.generator('particles'), viewport=(WIDTH, HEIGHT))
+    pool = fe.FireworkPool(system, WIDTH, HEIGHT, style, rng=streams.stream('fireworks'))
+    launch_rng = streams.stream('launch')
+    fireworks = [pool.acquire() for _ in range(10)]
+    update = system.update
+    simulate = 0.0
+
+    def timed_update():
+        nonlocal simulate
+        start = time.perf_counter()
+        update()
+        simulate += time.perf_counter() - start
+    system.update = timed_update  # 只为计时，update_fireworks 照常调用
+
+    particles = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        win.fill((0, 0, 0))
+        if launch_rng.randint(0, LAUNCH_CHANCE - 1) == 1:
+            fireworks.append(pool.acquire())
+        fe.update_fireworks(win, fireworks, system, pool)
+        particles += system.count
+    total = time.perf_counter() - start
+    if workers:
+        system.close()
+    return simulate / frames * 1000, total / frames * 1000, particles / simulate
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    cores = os.cpu_count() or 1
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(2, cores)
+    pygame.display.init()
+    win = pygame.display.set_mode((WIDTH, HEIGHT))
+    print(f"CPU 核心数: {cores}")
+    print(f"{'workers':>7} {'simulate(ms)':>13} {'frame(ms)':>10} {'particles/s':>13}")
+    workers = 0
+    while workers <= max_workers:
+        simulate, frame, rate = run(workers, frames, win)
+        print(f"{workers:>7} {simulate:>13.2f} {frame:>10.2f} {rate:>13,.0f}")
+        workers = workers * 2 if workers else 1
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
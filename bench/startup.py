@@ -0,0 +1,69 @@
+"""
+各入口脚本的启动耗时
+每个脚本在独立子进程中测量两项：
+  import 耗时       import 模块本身（应当只有定义函数和常量，不初始化 pygame、不建窗口、不算心形帧）
+  首帧耗时         调用 main(frames=1) 画完第一帧并退出
+pygame 场景使用 SDL 的 dummy 视频驱动；没有图形界面时 Tk 场景（xin）报错，结果中记为 error。
+用法：python bench/startup.py [--scripts yanhua,dad,ceshi,xin] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS = ('yanhua', 'dad', 'ceshi', 'xin')
+
+
+def measure(name):
+    """子进程内部：import 并画出第一帧，返回两段耗时（毫秒）"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    sys.path.insert(0, ROOT)
+    start = time.perf_counter()
+    module = __import__(name)
+    imported = time.perf_counter()
+    module.main(frames=1)
+    done = time.perf_counter()
+    return dict(import_ms=round((imported - start) * 1000, 2),
+                first_frame_ms=round((done - imported) * 1000, 2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='入口脚本启动耗时')
+    parser.add_argument('--scripts', default=','.join(SCRIPTS))
+    parser.add_argument('--repeat', type=int, default=3, help='每个脚本运行几次，取最小值')
+    parser.add_argument('--case', help=argparse.SUPPRESS)  # 子进程内部使用
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(measure(args.case)))
+        return
+
+    results = []
+    for name in args.scripts.split(','):
+        runs = []
+        error = None
+        for _ in range(args.repeat):
+            child = subprocess.run([sys.executable, os.path.abspath(__file__), '--case', name],
+                                   capture_output=True, text=True, cwd=ROOT)
+            if child.returncode != 0:
+                error = child.stderr.strip().splitlines()[-1:]
+                break
+            runs.append(json.loads(child.stdout.strip().splitlines()[-1]))
+        if error is not None:
+            result = dict(script=name, error=error)
+        else:
+            result = dict(script=name,
+                          import_ms=min(r['import_ms'] for r in runs),
+                          first_frame_ms=min(r['first_frame_ms'] for r in runs))
+        results.append(result)
+        print(f"{name:<7} " + (f"import {result['import_ms']:.1f} ms  first frame {result['first_frame_ms']:.1f} ms"
+                               if 'import_ms' in result else str(result['error'])),
+              file=sys.stderr)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
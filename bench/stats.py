@@ -0,0 +1,9 @@
+"""
+基准测试脚本共用的统计函数（以脚本方式运行时 bench/ 目录在 sys.path 最前面，可以直接 import）
+"""
+
+
+def percentile(samples, p):
+    """samples 的第 p 百分位数（排序后按位置取样本，不插值）"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
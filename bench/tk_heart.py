@@ -0,0 +1,59 @@
+"""
+xin.py 心形三种 Tk 渲染方式的基准测试（需要图形界面）
+items：每帧 delete('all') 后重建矩形（原始方式）
+pool ：矩形对象池，只更新 coords / state
+photo：每帧预先光栅化成 PhotoImage，绘制时只切换图片
+用法：python bench/tk_heart.py [测量帧数]
+"""
+import os
+import sys
+import time
+from tkinter import Tk, Canvas, TclError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import xin  # noqa: E402
+from stats import percentile  # noqa: E402
+
+
+def run(mode, frames):
+    root = Tk()
+    canvas = Canvas(root, bg='black', height=xin.CANVAS_HEIGHT, width=xin.CANVAS_WIDTH)
+    canvas.pack()
+    heart = xin.Heart()
+    heart.all_points.wait()
+    renderer = xin.RENDERERS[mode](canvas, heart)
+
+    # 第一轮：包含对象池扩容 / PhotoImage 构建的一次性开销
+    start = time.perf_counter()
+    for frame in range(heart.generate_frame):
+        renderer.render(frame)
+        root.update()
+    warmup = (time.perf_counter() - start) * 1000
+
+    times = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        renderer.render(frame)
+        root.update()  # 让 Tk 真正完成重绘
+        times.append((time.perf_counter() - start) * 1000)
+    root.destroy()
+    return warmup, times
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"{'mode':<6} {'warmup(ms)':>11} {'mean':>8} {'p50':>8} {'p99':>8} {'fps':>7}")
+    for mode in ('items', 'pool', 'photo'):
+        try:
+            warmup, times = run(mode, frames)
+        except TclError as e:
+            print(f"无法创建 Tk 窗口（需要图形界面）: {e}")
+            return
+        mean = sum(times) / len(times)
+        print(f"{mode:<6} {warmup:>11.1f} {mean:>8.2f} {percentile(times, 50):>8.2f} "
+              f"{percentile(times, 99):>8.2f} {1000 / mean:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+拖尾历史的微基准：原实现（列表 pop/insert + 每条拖尾每帧新建 Vector2、
+数组整体平移）对比现实现（环形缓冲 + head 指针，拖尾直接读缓冲）。
+数组两列只计更新与取出拖尾坐标，不含转换成 Python 列表的开销。
+三个脚本共用 firework_engine，差别只在每次爆炸的粒子数，
+这里按各自的粒子数范围、10 个同时存在的烟花取样。
+用法：python bench/trail.py [帧数]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+import effects.firework_engine as fe  # noqa: E402
+
+SCENES = {'yanhua.py': (100, 225), 'dad.py': (150, 300), 'ceshi.py': (150, 300)}
+CONCURRENT = 10
+vector = fe.vector
+
+
+class ListHistory:
+    """原实现：prev_posx / prev_posy 列表头部插入、尾部弹出，拖尾每帧 get_pos 新建 Vector2"""
+    def __init__(self):
+        self.pos = vector(0, 0)
+        self.prev_posx = [-10] * fe.HISTORY_LENGTH
+        self.prev_posy = [-10] * fe.HISTORY_LENGTH
+        self.trails = [vector(-10, -10) for _ in range(fe.TRAIL_COUNT)]
+
+    def trail_update(self):
+        self.prev_posx.pop()
+        self.prev_posx.insert(0, int(self.pos.x))
+        self.prev_posy.pop()
+        self.prev_posy.insert(0, int(self.pos.y))
+        for n in range(fe.TRAIL_COUNT):
+            self.trails[n] = vector(self.prev_posx[n + fe.dynamic_offset],
+                                    self.prev_posy[n + fe.dynamic_offset])
+
+
+def object_list(n, ticks):
+    particles = [ListHistory() for _ in range(n)]
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for p in particles:
+            p.pos.y += 1
+            p.trail_update()
+            for t in p.trails:
+                (int(t.x), int(t.y))  # 绘制时读取的坐标
+    return time.perf_counter() - start
+
+
+def object_ring(n, ticks):
+    particles = [fe.Particle(0, 0, (255, 255, 255)) for _ in range(n)]
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for p in particles:
+            p.pos.y += 1
+            p.trail_update()
+            for t in p.trails:
+                p.prev_pos(t.pos_in_line + fe.dynamic_offset)
+    return time.perf_counter() - start
+
+
+def array_shift(n, ticks):
+    pos = np.zeros((n, 2))
+    history = np.full((n, fe.HISTORY_LENGTH, 2), -10, dtype=np.int64)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        pos[:, 1] += 1
+        history[:, 1:] = history[:, :-1]
+        history[:, 0] = np.trunc(pos)
+        history[:, fe.static_offset:fe.static_offset + fe.TRAIL_COUNT].copy()
+    return time.perf_counter() - start
+
+
+def array_ring(n, ticks):
+    pos = np.zeros((n, 2))
+    history = np.full((fe.HISTORY_LENGTH, n, 2), -10, dtype=np.int64)  # 与 ParticleSystem 相同的布局
+    head = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        pos[:, 1] += 1
+        history[head] = np.trunc(pos)
+        head = (head + 1) % fe.HISTORY_LENGTH
+        history[fe._TRAIL_SLOTS[head]]
+    return time.perf_counter() - start
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    cases = (('对象/列表 pop+insert', object_list), ('对象/环形缓冲', object_ring),
+             ('数组/整体平移', array_shift), ('数组/环形缓冲', array_ring))
+    print(f"{'脚本':<10} {'粒子数':>6}  " + '  '.join(f'{name:>14}' for name, _ in cases) + '   (ns/粒子/帧)')
+    for script, (low, high) in SCENES.items():
+        n = (low + high) // 2 * CONCURRENT
+        costs = [fn(n, ticks) / (n * ticks) * 1e9 for _, fn in cases]
+        print(f"{script:<10} {n:>6}  " + '  '.join(f'{c:>14.1f}' for c in costs))
+
+
+if __name__ == '__main__':
+    main()
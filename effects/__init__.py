@@ -0,0 +1,15 @@
+"""
+心形与烟花特效包
+导入任何模块都只定义类和函数，不初始化 pygame、不打开窗口、不创建 Tk，
+各子系统在第一次真正用到时才初始化，因此每个部分都可以单独导入、测试和做基准测试。
+  display          按需初始化 pygame 显示子系统并打开窗口
+  heart            HeartLayer：心形帧的生成、缓存与绘制
+  fireworks        FireworkShow：烟花发射、粒子系统与绘制
+  particle_shards  ShardedParticleSystem：多进程分片模拟烟花粒子（粒子数组放在共享内存里）
+  popups           TipPopups：tkinter 提示弹窗（第一次弹窗时才创建 Tk）
+  tip_overlay      VirtualTips：直接画在 pygame 画面上的提示框（不建原生窗口）
+  heart_engine / heart_raster / frame_cache       心形的向量化计算、预光栅化与磁盘缓存
+  firework_engine / circle_sprites / rng_streams  烟花粒子、圆点精灵、随机数流
+  dirty_rects / frame_profiler                    脏矩形刷新、分阶段帧计时
+yanhua.py、dad.py、ceshi.py 只是用这些对象拼出场景的启动脚本。
+"""
@@ -0,0 +1,85 @@
+"""
+圆点精灵缓存（pygame）
+按 (颜色, 半径) 预先画好一张圆点 Surface，之后每个圆点只需一次 blit，
+整帧的圆点收集成一个序列用一次 Surface.blits（pygame-ce 上为 fblits）提交，
+代替每个粒子、拖尾一次 pygame.draw.circle。
+pygame.draw.circle 以 (cx, cy) 为圆心、r 为半径时只覆盖 [cx - r, cx + r - 1]，
+所以精灵边长取 2r、圆心画在 (r, r)，贴到 (cx - r, cy - r) 与直接画圆逐像素一致。
+烟花颜色每次随机，缓存按最近使用顺序淘汰，总像素内存不超过 max_bytes。
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+MAX_SPRITE_BYTES = 2 * 1024 * 1024  # 精灵缓存的像素内存上限（字节）
+
+
+def render_circle(colour, radius):
+    """画一张边长 2 * radius 的圆点精灵，圆外为色键透明"""
+    size = 2 * radius
+    surface = pygame.Surface((size, size))
+    key = tuple(255 - c for c in colour)  # 每个分量都与圆点颜色不同
+    surface.fill(key)
+    pygame.draw.circle(surface, colour, (radius, radius), radius)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()  # 转成屏幕像素格式，blit 时不再逐像素转换
+    surface.set_colorkey(key, pygame.RLEACCEL)
+    return surface
+
+
+class CircleSprites:
+    """(颜色, 半径) -> 圆点精灵的 LRU 缓存"""
+    def __init__(self, max_bytes=MAX_SPRITE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._sprites = OrderedDict()
+
+    def get(self, colour, radius):
+        """取 (colour, radius) 的精灵，没有则画一张，超过内存上限时淘汰最久未用的"""
+        key = (colour, radius)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            return sprite
+        sprite = render_circle(colour, radius)
+        self._sprites[key] = sprite
+        self.bytes += sprite.get_pitch() * sprite.get_height()
+        while self.bytes > self.max_bytes and len(self._sprites) > 1:
+            _, old = self._sprites.popitem(last=False)
+            self.bytes -= old.get_pitch() * old.get_height()
+            self.evictions += 1
+        return sprite
+
+    def draw(self, target, colour, center, radius):
+        """与 pygame.draw.circle(target, colour, center, radius) 效果相同"""
+        if radius < 1:
+            return
+        target.blit(self.get(tuple(colour), radius), (center[0] - radius, center[1] - radius))
+
+    def lookup(self, colours, radii):
+        """一批圆点的精灵：colours 为 (N, 3) uint8，radii 为 (N,) 正整数，返回长度 N 的对象数组
+        相同 (颜色, 半径) 只查一次缓存"""
+        keys = (colours.astype(np.int64) @ np.array([1 << 16, 1 << 8, 1])) << 8 | radii
+        unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        sprites = np.empty(len(unique), dtype=object)
+        for i, (colour, radius) in enumerate(zip(colours[first].tolist(), radii[first].tolist())):
+            sprites[i] = self.get(tuple(colour), radius)
+        return sprites[inverse.reshape(-1)]
+
+    def __len__(self):
+        return len(self._sprites)
+
+
+def blit_batch(target, sprites, topleft):
+    """用一次调用把 sprites（精灵对象数组）依次贴到 topleft（(N, 2) 左上角坐标）
+    坐标按列转成 (x, y) 元组，序列以迭代器交给 blits，不预先建出整个列表：
+    每帧几万个临时列表会频繁触发垃圾回收，比 blit 本身还慢"""
+    x, y = topleft.T.tolist()
+    sequence = zip(sprites.tolist(), zip(x, y))
+    fblits = getattr(target, 'fblits', None)  # pygame-ce 才有
+    if fblits is not None:
+        fblits(list(sequence))
+    else:
+        target.blits(sequence, doreturn=False)
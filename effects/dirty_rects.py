@@ -0,0 +1,119 @@
+"""
+脏矩形刷新（pygame）
+屏幕划分为 TILE×TILE 的瓦片，每帧记录心形、烟花弹、爆炸粒子及拖尾画到的瓦片；
+下一帧开始时只把上一帧画过的瓦片填回背景色，帧末只把本帧和上一帧画过的瓦片
+合并成少量矩形交给 pygame.display.update，代替每帧整屏 fill + 整屏刷新。
+需要刷新的面积超过 full_ratio 时自动退回整屏刷新（矩形太多时逐块拷贝反而更慢）。
+刷新由 present(rects=None) 完成，默认为 pygame.display.update；
+在缩小的内部画布上作画时传入 ScaledScreen.present，只放大需要刷新的矩形。
+"""
+import numpy as np
+import pygame
+
+TILE = 32  # 瓦片边长（像素），须大于所画圆点的半径
+FULL_UPDATE_RATIO = 0.5  # 需要刷新的瓦片占比超过该值时整屏刷新
+
+
+class DirtyRegion:
+    """按瓦片记录画过的区域；enabled 为 False 时每帧整屏清除、整屏刷新（原行为）"""
+    def __init__(self, size, enabled=True, tile=TILE, full_ratio=FULL_UPDATE_RATIO, present=None):
+        self.width, self.height = size
+        self.enabled = enabled
+        self.present = present or pygame.display.update
+        self.tile = tile
+        self.full_ratio = full_ratio
+        shape = (-(-self.width // tile), -(-self.height // tile))
+        self._current = np.zeros(shape, dtype=bool)  # 本帧画过的瓦片，下标为 [列, 行]
+        self._previous = np.zeros(shape, dtype=bool)  # 上一帧画过的瓦片
+        self._full = True  # 第一帧整屏清除并刷新
+        self.coverage = 1.0  # 最近一帧刷新的面积占比
+        self.full_updates = 0
+        self.partial_updates = 0
+
+    def invalidate(self):
+        """本帧整个画面都被改动了（例如叠加了整屏的图层）：本帧整屏刷新，下一帧整屏清除"""
+        if self.enabled:
+            self._current[:] = True
+
+    def add_rect(self, rect):
+        """记录本帧画过的矩形 (x, y, w, h)；None 表示没有画"""
+        if not self.enabled or rect is None:
+            return
+        x, y, w, h = rect
+        left, top = max(x, 0), max(y, 0)
+        right, bottom = min(x + w, self.width), min(y + h, self.height)
+        if right <= left or bottom <= top:
+            return
+        t = self.tile
+        self._current[left // t:(right - 1) // t + 1, top // t:(bottom - 1) // t + 1] = True
+
+    def add_circles(self, centers, radius):
+        """记录本帧画过的一批圆点：centers 为 (N, 2) 圆心，radius 为半径（标量或长度 N 的数组）"""
+        if not self.enabled or len(centers) == 0:
+            return
+        centers = np.asarray(centers)
+        radius = np.asarray(radius)
+        if radius.ndim:
+            radius = radius[:, None]
+        low, high = centers - radius, centers + radius
+        visible = ((high[:, 0] >= 0) & (high[:, 1] >= 0)
+                   & (low[:, 0] < self.width) & (low[:, 1] < self.height))
+        limit = (self.width - 1, self.height - 1)
+        low = (np.clip(low[visible], 0, limit) // self.tile).astype(np.intp)
+        high = (np.clip(high[visible], 0, limit) // self.tile).astype(np.intp)
+        # 半径小于瓦片边长，外接正方形最多跨 2×2 个瓦片，标记四个角所在的瓦片即可
+        for xs in (low[:, 0], high[:, 0]):
+            for ys in (low[:, 1], high[:, 1]):
+                self._current[xs, ys] = True
+
+    def clear(self, surface, colour):
+        """帧开始时调用：把上一帧画过的瓦片填回背景色"""
+        if not self.enabled or self._full:
+            surface.fill(colour)
+            return
+        for rect in self._rects(self._previous):
+            surface.fill(colour, rect)
+
+    def update(self):
+        """帧末调用：刷新本帧和上一帧画过的区域，返回本次是否整屏刷新"""
+        if not self.enabled:
+            self.present()
+            return True
+        union = self._current | self._previous
+        self.coverage = float(union.mean())
+        full = self._full or self.coverage > self.full_ratio
+        if full:
+            self.present()
+            self.full_updates += 1
+        else:
+            self.present(self._rects(union))
+            self.partial_updates += 1
+        self._full = False
+        self._previous, self._current = self._current, self._previous
+        self._current[:] = False
+        return full
+
+    def _rects(self, tiles):
+        """把瓦片掩码合并成矩形：每行相邻瓦片连成一段，上下两行相同的段再纵向合并"""
+        t = self.tile
+        screen = pygame.Rect(0, 0, self.width, self.height)
+        rects = []
+        # 每行的段边界一次算出：按行优先排列，相邻两个边界为一段的起止列
+        rows, cols = np.nonzero(np.diff(tiles, axis=0, prepend=False, append=False).T)
+        open_runs = {}  # (起始列, 结束列) -> 上一行延伸下来的矩形
+        runs = {}
+        current_row = -1
+        for row, start, end in zip(rows[::2].tolist(), cols[::2].tolist(), cols[1::2].tolist()):
+            if row != current_row:
+                # 进入新的一行：只有紧邻的上一行的段可以继续向下延伸
+                open_runs = runs if row == current_row + 1 else {}
+                runs = {}
+                current_row = row
+            rect = open_runs.get((start, end))
+            if rect is None:
+                rect = pygame.Rect(start * t, row * t, (end - start) * t, t)
+                rects.append(rect)
+            else:
+                rect.height += t
+            runs[start, end] = rect
+        return [rect.clip(screen) for rect in rects]
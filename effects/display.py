@@ -0,0 +1,109 @@
+"""
+pygame 窗口的按需初始化
+只初始化显示子系统，并推迟到真正打开窗口时才执行：
+pygame.init() 会把音频、手柄等用不到的子系统一并初始化，启动时白白多花时间。
+"""
+from math import gcd
+
+import pygame
+
+
+def open_window(size=None, caption='', fullscreen=False):
+    """打开窗口并返回屏幕 Surface；size 为 None 时使用当前显示器的分辨率"""
+    pygame.display.init()
+    if size is None:
+        info = pygame.display.Info()
+        size = (info.current_w, info.current_h)
+    screen = pygame.display.set_mode(size, pygame.FULLSCREEN if fullscreen else 0)
+    pygame.display.set_caption(caption)
+    return screen
+
+
+def close_window():
+    pygame.quit()
+
+
+SCALE_STEPS = (1.0, 0.75, 0.5)  # 自适应降分辨率时依次尝试的内部分辨率比例
+
+
+class ScaledScreen:
+    """以 scale 倍的内部分辨率作画，每帧把画过的区域放大到显示器上
+    场景都画在 surface 上，尺寸、心形中心和放大倍数都按 size（内部坐标）计算；
+    scale 为 1 时 surface 就是显示器本身，不多做任何拷贝。
+    放大用最近邻（transform.scale），4K 下整屏放大约为 smoothscale 的 1/5；
+    配合 DirtyRegion 时只放大本帧刷新的矩形。
+    放大本身也有代价（dummy 驱动下 1080p → 4K 整屏放大约 8 ms），只有绘制代价随像素数增长的场景才划算。
+    adaptive 为 True 时，最近 window 帧的平均耗时超过 budget_ms 就降到 SCALE_STEPS 的下一档（不低于 min_scale）；
+    降档后的第一个 window 反而更慢则退回上一档并停止调整（只与降档前比较这一次，之后负载再升高照常降档）。scale 改变时 frame_time 返回 True，通知场景按新的 size 重建图层。
+    """
+    def __init__(self, display, scale=1.0, adaptive=False, budget_ms=1000 / 60, window=60, min_scale=0.5):
+        self.display = display
+        self.adaptive = adaptive
+        self.budget_ms = budget_ms
+        self.window = window
+        self.min_scale = min_scale
+        self.rescales = 0  # 自适应调整的次数
+        self._times = []
+        self._previous = None  # 刚降档时为降档前的 (scale, 平均耗时)，降档后第一个 window 判断完即清空
+        self._set_scale(scale)
+
+    def _set_scale(self, scale):
+        self.scale = scale
+        width, height = self.display.get_size()
+        if scale == 1:
+            self.surface = self.display
+        else:
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            self.surface = pygame.Surface(size).convert(self.display)
+        self.size = self.surface.get_size()
+        # 矩形边界对齐到内部与显示器像素恰好对应的位置，局部放大的采样才与整屏放大一致
+        self._align = [inner // gcd(inner, outer) for inner, outer in zip(self.size, (width, height))]
+
+    def present(self, rects=None):
+        """把 surface 上的 rects（内部坐标，None 表示整个画面）放大到显示器并刷新"""
+        if self.surface is self.display:
+            pygame.display.update(rects)
+            return
+        if rects is None:
+            pygame.transform.scale(self.surface, self.display.get_size(), self.display)
+            pygame.display.update()
+            return
+        (width, height), (display_w, display_h) = self.size, self.display.get_size()
+        updated = []
+        align_x, align_y = self._align
+        for rect in rects:
+            x, y = rect.x - rect.x % align_x, rect.y - rect.y % align_y
+            right = min(width, -(-rect.right // align_x) * align_x)
+            bottom = min(height, -(-rect.bottom // align_y) * align_y)
+            # 内部坐标 [x, right) 对应显示器坐标 [x * W // w, right * W // w)
+            target = pygame.Rect(x * display_w // width, y * display_h // height, 0, 0)
+            target.width = right * display_w // width - target.x
+            target.height = bottom * display_h // height - target.y
+            pygame.transform.scale(self.surface.subsurface((x, y, right - x, bottom - y)), target.size,
+                                   self.display.subsurface(target))
+            updated.append(target)
+        pygame.display.update(updated)
+
+    def frame_time(self, ms):
+        """主循环每帧报告本帧的计算耗时（毫秒，不含等待）；返回 True 表示刚降了一档，size 已改变"""
+        if not self.adaptive:
+            return False
+        self._times.append(ms)
+        if len(self._times) < self.window:
+            return False
+        mean = sum(self._times) / len(self._times)
+        self._times = []
+        previous, self._previous = self._previous, None
+        if previous is not None and mean >= previous[1]:
+            # 降档没有变快（放大的代价超过了少画的像素）：退回并不再调整
+            self.adaptive = False
+            self._set_scale(previous[0])
+            self.rescales += 1
+            return True
+        lower = [s for s in SCALE_STEPS if self.min_scale <= s < self.scale]
+        if mean <= self.budget_ms or not lower:
+            return False
+        self._previous = (self.scale, mean)
+        self._set_scale(lower[0])
+        self.rescales += 1
+        return True
@@ -0,0 +1,510 @@
+"""
+烟花效果引擎（pygame）
+升空的烟花弹仍是单个 Particle 对象（每个烟花只有一个）；
+爆炸产生的粒子全部放进 ParticleSystem：位置、速度、寿命、颜色、大小等属性
+各占一个连续的 NumPy 数组，所有烟花的粒子每帧用一次向量化运算统一更新。
+给了 CircleSprites 时，所有圆点改为贴缓存的精灵，粒子整帧一次 blits 提交。
+给了 FadeTrails 时不画拖尾圆点，粒子每帧只画一次到渐隐层上，由渐隐层留下残影。
+随机数全部取自传入的随机数流（rng_streams），用同一个种子派生即可逐位复现整场烟花。
+yanhua.py、dad.py、ceshi.py 共用这份实现，只是样式参数不同。
+"""
+from itertools import count
+
+import numpy as np
+import pygame
+
+from .circle_sprites import blit_batch
+from .rng_streams import RandomStream
+
+vector = pygame.math.Vector2
+gravity = vector(0, 0.3)
+trail_colours = [(45, 45, 45), (60, 60, 60), (75, 75, 75),
+                 (125, 125, 125), (150, 150, 150)]
+dynamic_offset = 1
+static_offset = 5
+HISTORY_LENGTH = 10  # 每个粒子记录的历史位置数
+TRAIL_COUNT = 5  # 每个粒子的拖尾数
+SPARK_TRAIL_COLOUR = (255, 255, 200)  # 爆炸粒子拖尾颜色
+FADE_STEP = 24  # 渐隐拖尾每帧各颜色分量减去的值（越小残影越长）
+
+# 烟花样式（dad.py / ceshi.py 的参数）
+DEFAULT_STYLE = {
+    'particles': (150, 300),  # 每次爆炸的粒子数范围
+    'explosion_radius': (8, 22),  # 爆炸半径范围
+    'spread_min': 8,  # 粒子初速度倍数的下限
+    'launch_speed': (15, 22),  # 烟花弹升空速度范围
+    'shell_size': 6,  # 烟花弹大小
+    'particle_size': (3, 5),  # 爆炸粒子大小范围
+}
+
+DEFAULT_CAPACITY = 8192  # 粒子数组的初始容量（约 30 次同时存在的最大爆炸）
+
+_firework_ids = count()
+# 写入位置为 head 时，爆炸粒子各条拖尾（static_offset 帧前起）在环形缓冲中的下标
+_TRAIL_SLOTS = [(head - 1 - static_offset - np.arange(TRAIL_COUNT)) % HISTORY_LENGTH
+                for head in range(HISTORY_LENGTH)]
+
+
+_default_stream = RandomStream()  # 没有传入随机数流时使用（不可复现）
+
+
+def random_colour(rng):
+    return rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)
+
+
+class Firework:
+    """一个烟花：升空阶段自己更新烟花弹，爆炸后粒子交给 ParticleSystem"""
+    def __init__(self, system, display_width, display_height, style=DEFAULT_STYLE, rng=None):
+        self.system = system
+        self.display_width = display_width
+        self.display_height = display_height
+        self.style = style
+        self.rng = rng or _default_stream  # RandomStream：颜色、发射位置和速度、粒子数
+        self.firework = Particle(0, display_height, None, style)
+        self.reset()
+
+    def reset(self):
+        """重新发射：换新的 id 和颜色，烟花弹回到屏幕底部（复用已有对象）"""
+        self.id = next(_firework_ids)
+        rng = self.rng
+        self.colour = random_colour(rng)
+        self.colours = (random_colour(rng), random_colour(rng), random_colour(rng))
+        self.firework.reset(rng.randint(0, self.display_width), self.display_height, self.colour,
+                            -rng.randint(*self.style['launch_speed']))
+        self.exploded = False
+
+    def update(self, win):
+        if not self.exploded:
+            self.firework.apply_force(gravity)
+            self.firework.move()
+            circle = self.system.circle
+            if self.system.fade is None:
+                for tf in self.firework.trails:
+                    tf.show(win, circle)
+            self.show(win, circle)
+            if self.firework.vel.y >= 0:
+                self.exploded = True
+                self.explode()
+
+    def explode(self):
+        amount = self.rng.randint(*self.style['particles'])
+        self.system.spawn(self.id, self.firework.pos.x, self.firework.pos.y,
+                          amount, self.colours, self.style)
+
+    def show(self, win, circle=pygame.draw.circle):
+        circle(win, self.colour,
+               (int(self.firework.pos.x), int(self.firework.pos.y)),
+               self.firework.size)
+
+    def mark_dirty(self, dirty):
+        """把烟花弹及其拖尾本帧画到的区域记入 dirty（DirtyRegion）"""
+        shell = self.firework
+        points = [shell.prev_pos(t.pos_in_line + dynamic_offset) for t in shell.trails]
+        points.append((int(shell.pos.x), int(shell.pos.y)))
+        dirty.add_circles(np.array(points), shell.size)
+
+    def remove(self):
+        if self.exploded:
+            return self.system.live_count(self.id) == 0
+        return False
+
+
+class Particle:
+    """升空中的烟花弹"""
+    def __init__(self, x, y, colour, style=DEFAULT_STYLE):
+        self.style = style
+        self.pos = vector(x, y)
+        self.acc = vector(0, 0)
+        self.vel = vector(0, 0)
+        self.size = style['shell_size']
+        self.trails = [Trail(i, self.size, self) for i in range(TRAIL_COUNT)]
+        # 历史位置环形缓冲：head 指向下一次写入的位置，写入时不移动其他元素
+        self.prev_posx = [-10] * HISTORY_LENGTH
+        self.prev_posy = [-10] * HISTORY_LENGTH
+        self.reset(x, y, colour, 0)
+
+    def reset(self, x, y, colour, vel_y):
+        """以竖直速度 vel_y 在 (x, y) 处重新发射，原地重置所有状态"""
+        self.pos.x, self.pos.y = x, y
+        self.acc.x, self.acc.y = 0, 0
+        self.vel.x, self.vel.y = 0, vel_y
+        self.colour = colour
+        for i in range(HISTORY_LENGTH):
+            self.prev_posx[i] = self.prev_posy[i] = -10
+        self.head = 0
+
+    def apply_force(self, force):
+        self.acc += force
+
+    def move(self):
+        self.vel += self.acc
+        self.pos += self.vel
+        self.acc *= 0
+        self.trail_update()
+
+    def trail_update(self):
+        self.prev_posx[self.head] = int(self.pos.x)
+        self.prev_posy[self.head] = int(self.pos.y)
+        self.head = (self.head + 1) % HISTORY_LENGTH
+
+    def prev_pos(self, n):
+        """n 帧前的位置（0 为最新）"""
+        i = (self.head - 1 - n) % HISTORY_LENGTH
+        return self.prev_posx[i], self.prev_posy[i]
+
+
+class Trail:
+    """烟花弹的拖尾（颜色由亮到暗、尺寸逐渐变小），位置直接从烟花弹的历史缓冲读取"""
+    def __init__(self, n, size, particle):
+        self.pos_in_line = n
+        self.particle = particle
+        self.colour = trail_colours[n]
+        self.size = int(size - n / 2)
+
+    def show(self, win, circle=pygame.draw.circle):
+        circle(win, self.colour,
+               self.particle.prev_pos(self.pos_in_line + dynamic_offset),
+               self.size)
+
+
+class FireworkPool:
+    """预先创建的烟花对象池
+    结束的烟花回收进池子，发射新烟花时重置复用，运行中不再新建 Particle / Trail 对象；
+    池子空了才临时新建一个（之后同样会被回收）。
+    """
+    def __init__(self, system, display_width, display_height, style=DEFAULT_STYLE, size=32, rng=None):
+        self.system = system
+        self.display_width = display_width
+        self.display_height = display_height
+        self.style = style
+        self.rng = rng  # 所有烟花共用的 RandomStream
+        self.free = [self._create() for _ in range(size)]
+
+    def _create(self):
+        return Firework(self.system, self.display_width, self.display_height, self.style, self.rng)
+
+    def acquire(self):
+        if not self.free:
+            return self._create()
+        fw = self.free.pop()
+        fw.reset()
+        return fw
+
+    def release(self, fw):
+        self.free.append(fw)
+
+
+class FadeTrails:
+    """渐隐拖尾层：与窗口同尺寸的黑底 Surface，烟花每帧只画一次到这一层上
+    每帧开始时各颜色分量减去 step（按固定值递减，保证最终回到纯黑），
+    画完后整层以加法混合叠到窗口上，黑色部分不改变窗口内容。
+    每帧代价是两次整层的像素运算，与粒子数无关；代替每个粒子 5 个拖尾圆点。
+    减法用 blit 一条填好 step 的横条来做：带混合标志的 fill 没有 SIMD 实现，比 blit 慢一个数量级。
+    """
+    STRIP_HEIGHT = 64
+
+    def __init__(self, step=FADE_STEP):
+        self.step = step
+        self.layer = None
+        self._strip = None
+        self._rows = []
+
+    def begin(self, win):
+        """淡化上一帧的内容，返回本帧要画入的层"""
+        if self.layer is None or self.layer.get_size() != win.get_size():
+            width, height = win.get_size()
+            self.layer = pygame.Surface((width, height))
+            self.layer.fill((0, 0, 0))
+            self._strip = pygame.Surface((width, self.STRIP_HEIGHT))
+            self._strip.fill((self.step, self.step, self.step))
+            self._rows = [(self._strip, (0, y), None, pygame.BLEND_RGB_SUB)
+                          for y in range(0, height, self.STRIP_HEIGHT)]
+        self.layer.blits(self._rows, doreturn=False)
+        return self.layer
+
+    def composite(self, win):
+        """把渐隐层叠加到窗口上"""
+        win.blit(self.layer, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+
+
+class ParticleSystem:
+    """所有爆炸粒子的结构数组
+    每个粒子占各数组的一行，前 count 行为有效粒子；owner 记录所属烟花的 id。
+    数组按容量预先分配（并预先写入一遍，让内存页在启动时就真正分配好），
+    爆炸时只初始化空闲的行，容量不够时才成倍扩容；移除粒子时用末尾的存活粒子填补空位，
+    每个烟花的存活粒子数单独计数，查询是 O(1)。
+    物理规则与原来逐个 Particle 对象时一致：
+    每帧受重力一半加上随机扰动的力，速度先乘 0.8 阻尼，
+    第一帧飞出爆炸半径即移除，之后按寿命以 1/31、1/6 的概率随机衰减。
+    给了 buffer（例如 SharedMemory.buf，大小见 buffer_size）时所有数组都建在这块内存里，
+    容量固定为 capacity，装不下的爆炸粒子直接丢弃（供 particle_shards 跨进程共享粒子状态）。
+    """
+    FIELDS = (
+        ('pos', (2,), np.float64),
+        ('vel', (2,), np.float64),
+        ('origin', (2,), np.float64),
+        ('life', (), np.int64),
+        ('explosion_radius', (), np.int64),
+        ('size', (), np.int64),
+        ('colour', (3,), np.uint8),
+        ('owner', (), np.int64),
+        ('remove', (), np.bool_),
+    )
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, seed=None, sprites=None, fade=None, viewport=None,
+                 buffer=None):
+        self.rng = np.random.default_rng(seed)  # seed 可以是整数种子，也可以直接是 Generator
+        self.buffer = buffer
+        # 给了 sprites（CircleSprites）则粒子和烟花弹都用缓存的圆点精灵绘制
+        self.sprites = sprites
+        # 给了 fade（FadeTrails）则不画拖尾圆点，改由渐隐层留下残影
+        self.fade = fade
+        # 给了 viewport（宽, 高）则落到画面下方、连同拖尾都看不见的粒子直接移除
+        self.viewport = viewport
+        self.culled = 0  # 上一次 show 因在画面外而跳过的圆点数
+        self.retired_offscreen = 0  # 因落出画面而提前移除的粒子数（累计）
+        self.circle = pygame.draw.circle if sprites is None else sprites.draw
+        self.count = 0
+        self.capacity = 0
+        self.head = 0
+        self._live = {}  # 烟花 id -> 尚未被标记移除的粒子数
+        self._dead = 0  # 上一帧被标记移除、等待清理的粒子数
+        self._allocate(capacity)
+
+    @classmethod
+    def _layout_fields(cls, capacity):
+        """各数组的 (名字, 形状, 类型, 在 buffer 中的偏移)，每个数组按 64 字节对齐"""
+        fields = [(name, (capacity,) + shape, dtype) for name, shape, dtype in cls.FIELDS]
+        fields.append(('history', (HISTORY_LENGTH, capacity, 2), np.int64))
+        offset = 0
+        layout = []
+        for name, shape, dtype in fields:
+            layout.append((name, shape, dtype, offset))
+            offset += -(-int(np.prod(shape)) * np.dtype(dtype).itemsize // 64) * 64
+        return layout, offset
+
+    @classmethod
+    def buffer_size(cls, capacity):
+        """容量为 capacity 时 buffer 需要的字节数"""
+        return cls._layout_fields(capacity)[1]
+
+    def _allocate(self, capacity):
+        """把各数组扩容到 capacity，保留前 count 个粒子"""
+        if self.buffer is not None:
+            for name, shape, dtype, offset in self._layout_fields(capacity)[0]:
+                array = np.ndarray(shape, dtype=dtype, buffer=self.buffer, offset=offset)
+                array.fill(-10 if name == 'history' else 0)
+                setattr(self, name, array)
+            self.capacity = capacity
+            return
+        n = self.count
+        for name, shape, dtype in self.FIELDS:
+            array = np.empty((capacity,) + shape, dtype=dtype)
+            array.fill(0)  # np.zeros 的内存页要到第一次写入才分配，这里提前写一遍
+            if n:
+                array[:n] = getattr(self, name)[:n]
+            setattr(self, name, array)
+        # 历史位置环形缓冲，形状 (HISTORY_LENGTH, 容量, 2)：
+        # 所有粒子同步前进，共用一个写入位置 head，每帧只写一整块连续内存
+        history = np.full((HISTORY_LENGTH, capacity, 2), -10, dtype=np.int64)
+        if n:
+            history[:, :n] = self.history[:, :n]
+        self.history = history
+        self.capacity = capacity
+
+    def spawn(self, owner, x, y, amount, colours, style=DEFAULT_STYLE):
+        """在 (x, y) 处生成 amount 个爆炸粒子"""
+        rng = self.rng
+        start, end = self.count, self.count + amount
+        if end > self.capacity:
+            if self.buffer is not None:
+                end = self.capacity
+                amount = end - start
+                if amount <= 0:
+                    return
+            else:
+                self._allocate(max(end, self.capacity * 2))
+        new = slice(start, end)
+
+        radius = rng.integers(style['explosion_radius'][0], style['explosion_radius'][1] + 1, amount)
+        # x、y 方向各自乘一个 [spread_min, 爆炸半径 + 2] 的随机整数
+        spread = rng.integers(style['spread_min'], radius[:, None] + 3, (amount, 2))
+        self.vel[new] = rng.uniform(-1, 1, (amount, 2)) * spread
+        self.pos[new] = (x, y)
+        self.origin[new] = (x, y)
+        self.life[new] = 0
+        self.explosion_radius[new] = radius
+        self.size[new] = rng.integers(style['particle_size'][0], style['particle_size'][1] + 1, amount)
+        self.colour[new] = np.array(colours, dtype=np.uint8)[rng.integers(0, len(colours), amount)]
+        self.owner[new] = owner
+        self.remove[new] = False
+        self.history[:, new] = -10
+        self.count = end
+        self._live[owner] = self._live.get(owner, 0) + amount
+
+    def _compact(self):
+        """清理上一帧标记移除的粒子：用末尾的存活粒子填补前面的空位，
+        只搬动与移除数相同的行，不重新分配数组"""
+        n = self.count
+        remove = self.remove[:n]
+        dead = np.flatnonzero(remove)
+        alive = n - len(dead)
+        holes = dead[dead < alive]
+        movers = alive + np.flatnonzero(~remove[alive:])
+        if len(holes):
+            for name, _, _ in self.FIELDS:
+                array = getattr(self, name)
+                array[holes] = array[movers]
+            self.history[:, holes] = self.history[:, movers]
+        self.count = alive
+        self._dead = 0
+
+    def update(self):
+        """所有粒子前进一帧（上一帧被标记移除的粒子先清理掉）"""
+        if self._dead:
+            self._compact()
+        n = self.count
+        if n == 0:
+            return
+        rng = self.rng
+        pos, vel, life, remove = self.pos[:n], self.vel[:n], self.life[:n], self.remove[:n]
+        force = np.empty((n, 2))
+        force[:, 0] = gravity.x + rng.uniform(-1, 1, n) / 20
+        force[:, 1] = gravity.y / 2 + rng.integers(1, 9, n) / 100
+        vel *= 0.8
+        vel += force
+        pos += vel
+
+        first = life == 0
+        if first.any():
+            distance = np.hypot(*(pos[first] - self.origin[:n][first]).T)
+            remove[first] = distance > self.explosion_radius[:n][first]
+        young = (life > 10) & (life < 50)
+        old = life > 50
+        remove |= young & (rng.integers(0, 31, n) == 0)
+        remove |= old & (rng.integers(0, 6, n) == 0)
+        if self.viewport is not None:
+            self._retire_offscreen(n)
+
+        # 本帧新标记的粒子（上一帧的已在开头清理掉）从各自烟花的计数中扣除
+        owners, counts = np.unique(self.owner[:n][remove], return_counts=True)
+        for owner, dead in zip(owners.tolist(), counts.tolist()):
+            live = self._live[owner] - dead
+            if live:
+                self._live[owner] = live
+            else:
+                del self._live[owner]
+            self._dead += dead
+
+        self.history[self.head, :n] = np.trunc(pos)
+        self.head = (self.head + 1) % HISTORY_LENGTH
+        life += 1
+
+    def _retire_offscreen(self, n):
+        """标记已落到画面下方的粒子：y 方向速度为正时受重力一直下落，不会再回到画面内
+        粒子本身和本帧要画的拖尾都在底边以下时才移除，拖尾不会被截断"""
+        height = self.viewport[1]
+        pos, size, remove = self.pos[:n], self.size[:n], self.remove[:n]
+        below = ~remove & (self.vel[:n, 1] > 0) & (np.trunc(pos[:, 1]) - size >= height)
+        if not below.any():
+            return
+        trail_size = size - 2
+        # 本帧写入历史后绘制用到的拖尾位置
+        trails = self.history[_TRAIL_SLOTS[(self.head + 1) % HISTORY_LENGTH], :n, 1]
+        below &= (trail_size <= 0) | (trails.min(axis=0) - trail_size >= height)
+        remove |= below
+        self.retired_offscreen += int(below.sum())
+
+    def show(self, win):
+        """绘制所有粒子及其拖尾（本帧刚被标记移除的粒子仍然绘制一次）
+        完全落在 win 外的圆点不画，跳过的个数记在 culled"""
+        n = self.count
+        if n == 0:
+            self.culled = 0
+            return
+        centers, radii, keep = self._layout(win, n)
+        if self.sprites is not None:
+            self._blit(win, n, centers, radii, keep)
+            return
+        circle = pygame.draw.circle
+        colours = [tuple(c) for c in self.colour[:n].tolist()]
+        rows, columns = np.nonzero(keep)  # 按行展开，保持每个粒子先拖尾后本体的顺序
+        last = keep.shape[1] - 1
+        for i, j, center, radius in zip(rows.tolist(), columns.tolist(),
+                                        centers[keep].tolist(), radii[keep].tolist()):
+            circle(win, colours[i] if j == last else SPARK_TRAIL_COLOUR, center, radius)
+
+    def _layout(self, win, n):
+        """本帧要画的圆点：(n, k, 2) 圆心、(n, k) 半径和是否要画的掩码
+        每行前 k - 1 列为拖尾（渐隐拖尾模式下没有），最后一列为粒子本身"""
+        size = self.size[:n]
+        if self.fade is not None:
+            centers = np.trunc(self.pos[:n])[:, None].astype(np.int64)
+            radii = size[:, None]
+        else:
+            centers = np.empty((n, TRAIL_COUNT + 1, 2), dtype=np.int64)
+            centers[:, :-1] = self.history[_TRAIL_SLOTS[self.head], :n].transpose(1, 0, 2)
+            centers[:, -1] = np.trunc(self.pos[:n])
+            radii = np.empty((n, TRAIL_COUNT + 1), dtype=np.int64)
+            radii[:, :-1] = (size - 2)[:, None]
+            radii[:, -1] = size
+        width, height = win.get_size()
+        x, y = centers[..., 0], centers[..., 1]
+        drawn = radii > 0
+        keep = drawn & (x + radii > 0) & (y + radii > 0) & (x - radii < width) & (y - radii < height)
+        self.culled = int(drawn.sum() - keep.sum())
+        return centers, radii, keep
+
+    def _blit(self, win, n, centers, radii, keep):
+        """show 的精灵版本：绘制顺序不变（每个粒子先画拖尾再画本体），整帧一次 blits 提交"""
+        sprites = np.empty(radii.shape, dtype=object)
+        sprites[:, -1] = self.sprites.lookup(self.colour[:n], self.size[:n])
+        if radii.shape[1] > 1 and keep[:, :-1].any():
+            trail_size = radii[:, 0]
+            trail_colours = np.broadcast_to(np.array(SPARK_TRAIL_COLOUR, dtype=np.uint8), (n, 3))
+            sprites[:, :-1] = self.sprites.lookup(trail_colours, np.maximum(trail_size, 1))[:, None]
+        blit_batch(win, sprites[keep], centers[keep] - radii[keep][:, None])
+
+    def mark_dirty(self, dirty):
+        """把所有粒子及拖尾本帧画到的区域记入 dirty（DirtyRegion），须在 show 之后调用"""
+        n = self.count
+        if n == 0:
+            return
+        size = self.size[:n]
+        dirty.add_circles(np.trunc(self.pos[:n]), size)
+        trails = self.history[_TRAIL_SLOTS[self.head], :n].reshape(-1, 2)
+        dirty.add_circles(trails, np.tile(np.maximum(size - 2, 0), TRAIL_COUNT))
+
+    def live_count(self, owner):
+        """某个烟花尚未被标记移除的粒子数"""
+        return self._live.get(owner, 0)
+
+
+def update_fireworks(win, fireworks, system, pool=None, dirty=None):
+    """推进一帧：烟花弹升空/爆炸，所有爆炸粒子统一更新并绘制，移除已结束的烟花
+    结束的烟花在原列表里就地压缩掉（一次遍历，不复制列表），给了 pool 则回收进对象池；
+    给了 dirty（DirtyRegion）则记录本帧画到的区域，供脏矩形刷新使用；
+    渐隐拖尾模式下烟花先画到渐隐层再整层叠到 win 上，残影遍布整个窗口，只能整屏刷新"""
+    target = win if system.fade is None else system.fade.begin(win)
+    track = dirty is not None and dirty.enabled and system.fade is None
+    for fw in fireworks:
+        rising = not fw.exploded
+        fw.update(target)
+        if rising and track:
+            fw.mark_dirty(dirty)
+    system.update()
+    system.show(target)
+    if track:
+        system.mark_dirty(dirty)
+    if system.fade is not None:
+        system.fade.composite(win)
+        if dirty is not None:
+            dirty.invalidate()
+    kept = 0
+    for fw in fireworks:
+        if not fw.remove():
+            fireworks[kept] = fw
+            kept += 1
+        elif pool is not None:
+            pool.release(fw)
+    del fireworks[kept:]
@@ -0,0 +1,61 @@
+"""
+一场烟花（pygame）
+FireworkShow 把粒子系统、烟花对象池、随机数流和随机发射的节奏组合在一起，
+yanhua.py、dad.py、ceshi.py 和基准测试共用，只是样式和参数不同。
+"""
+from .circle_sprites import CircleSprites
+from .firework_engine import DEFAULT_STYLE, FadeTrails, FireworkPool, ParticleSystem, update_fireworks
+from .particle_shards import ShardedParticleSystem
+from .rng_streams import RandomStreams
+
+
+class FireworkShow:
+    """正在燃放的一组烟花
+    每帧以 1/launch_chance 的概率自动发射一个（0 表示不自动发射）；
+    随机数都取自 streams（RandomStreams），同一种子逐位复现。
+    sprites / trails / culling 对应 ParticleSystem 的圆点精灵、拖尾画法和视口剔除。
+    workers 大于 0 时爆炸粒子分到这么多个子进程中模拟（ShardedParticleSystem），用完须调用 close。
+    """
+    def __init__(self, size, style=DEFAULT_STYLE, streams=None, launch_chance=11, initial=5,
+                 sprites=True, trails='circles', culling=True, workers=0):
+        width, height = size
+        streams = streams or RandomStreams()
+        self.launch_rng = streams.stream('launch')
+        self.launch_chance = launch_chance
+        options = dict(seed=streams.generator('particles'),
+                       sprites=CircleSprites() if sprites else None,
+                       fade=FadeTrails() if trails == 'fade' else None,
+                       viewport=size if culling else None)
+        if workers:
+            self.system = ShardedParticleSystem(workers, **options)
+        else:
+            self.system = ParticleSystem(**options)
+        self.pool = FireworkPool(self.system, width, height, style, rng=streams.stream('fireworks'))
+        self.fireworks = [self.pool.acquire() for _ in range(initial)]
+
+    def launch(self, count=1):
+        for _ in range(count):
+            self.fireworks.append(self.pool.acquire())
+
+    def roll_launch(self):
+        """按 launch_chance 随机决定本帧是否发射"""
+        if self.launch_chance and self.launch_rng.randint(0, self.launch_chance - 1) == 1:
+            self.launch()
+
+    def update(self, screen, dirty=None):
+        """推进并画出一帧（不含随机发射），dirty 见 update_fireworks"""
+        update_fireworks(screen, self.fireworks, self.system, self.pool, dirty)
+
+    def resize(self, size):
+        """画面尺寸改变（例如降低了内部分辨率）：之后发射的烟花按新尺寸计算，已在空中的原样燃放完"""
+        width, height = size
+        self.pool.display_width, self.pool.display_height = width, height
+        for fw in self.fireworks + self.pool.free:
+            fw.display_width, fw.display_height = width, height
+        if self.system.viewport is not None:
+            self.system.viewport = size
+
+    def close(self):
+        """结束粒子模拟子进程（单进程模拟时什么也不做）"""
+        if isinstance(self.system, ShardedParticleSystem):
+            self.system.close()
@@ -0,0 +1,132 @@
+"""
+心形预计算帧的磁盘缓存
+所有帧拼接成一个紧凑的二进制 .npy 文件（另存一份每帧起止偏移），
+下次启动时直接内存映射（mmap）读取，无需重新计算。
+缓存键由屏幕尺寸、放大倍数、帧数、随机种子等参数哈希得到；
+按最近使用时间淘汰，限制条目数和总大小，避免旧分辨率的缓存越积越多；
+写入中途退出遗留的临时文件也在淘汰时清理。
+"""
+import hashlib
+import os
+import tempfile
+import time
+
+import numpy as np
+
+CACHE_VERSION = 4  # 帧数据格式或生成算法变化时递增，旧缓存自动失效
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'dazuoye', 'heart'
+)
+STALE_SECONDS = 3600  # 遗留的临时文件超过这么久才删除（更新的可能是别的进程正在写的）
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class FrameCache:
+    """心形帧缓存：每个键对应 <key>.npy（点数据）和 <key>.idx.npy（帧偏移）"""
+    def __init__(self, directory=CACHE_DIR, max_entries=8, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(**params):
+        """由生成参数计算缓存键"""
+        text = repr((CACHE_VERSION, sorted(params.items())))
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()[:20]
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.npy', base + '.idx.npy'
+
+    def load(self, key):
+        """命中时返回 (内存映射的点数据, 帧偏移)，未命中或文件损坏返回 None"""
+        data_path, index_path = self._paths(key)
+        try:
+            points = np.load(data_path, mmap_mode='r')
+            offsets = np.load(index_path)
+        except (OSError, ValueError):
+            return None
+        if offsets.ndim != 1 or len(offsets) < 2 or offsets[-1] != len(points):
+            return None
+        os.utime(data_path)  # 刷新使用时间，供淘汰判断
+        return points, offsets
+
+    def store(self, key, points, offsets):
+        """写入所有帧拼接成的点数据和帧偏移（先写临时文件再原子替换），然后按限制淘汰旧条目"""
+        os.makedirs(self.directory, exist_ok=True)
+        data_path, index_path = self._paths(key)
+        # 先写索引再写数据：数据文件存在即代表条目完整
+        for path, array in ((index_path, offsets), (data_path, points)):
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.save(f, array)
+                os.replace(tmp, path)
+            except BaseException:
+                _remove(tmp)
+                raise
+        self.evict(keep=key)
+
+    def entries(self):
+        """返回 [(最近使用时间, 占用字节数, 键), ...]，按最近使用时间从旧到新排序"""
+        result = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return result
+        for name in names:
+            if not name.endswith('.npy') or name.endswith('.idx.npy'):
+                continue
+            key = name[:-len('.npy')]
+            data_path, index_path = self._paths(key)
+            try:
+                stat = os.stat(data_path)
+                size = stat.st_size + os.path.getsize(index_path)
+            except OSError:
+                continue
+            result.append((stat.st_mtime, size, key))
+        result.sort()
+        return result
+
+    def remove_stale(self):
+        """删除写入中途退出时遗留的文件：.tmp 临时文件，以及没有对应数据文件的 .idx.npy"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        now = time.time()
+        for name in names:
+            path = os.path.join(self.directory, name)
+            if name.endswith('.idx.npy'):
+                if os.path.exists(path[:-len('.idx.npy')] + '.npy'):
+                    continue
+            elif not name.endswith('.tmp'):
+                continue
+            try:
+                if now - os.path.getmtime(path) > STALE_SECONDS:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def evict(self, keep=None):
+        """清理遗留的临时文件，再淘汰最久未使用的条目，直到条目数和总大小都在限制内"""
+        self.remove_stale()
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, key in entries:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            for path in self._paths(key):
+                _remove(path)
+            count -= 1
+            total -= size
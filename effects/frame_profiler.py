@@ -0,0 +1,148 @@
+"""
+逐帧分阶段计时（pygame 主循环用）
+主循环每个阶段结束时调用 mark(阶段名)，记录与上一个标记之间的耗时；
+每个阶段保留最近 window 帧的样本，用于屏幕左上角的 HUD（按热键开关）
+显示均值 / p50 / p99 和耗时分布直方图，也可以把每帧样本写入 CSV 或 JSONL 文件离线分析。
+set_counter 记录的计数（例如视口剔除掉的绘制数）显示在 HUD 末尾。
+HUD 和日志都关闭时 mark() 只做一次属性判断，几乎没有开销。
+"""
+import json
+import time
+from collections import deque
+
+import pygame
+
+FRAME_BUDGET_MS = 1000 / 60
+HISTOGRAM_EDGES = (1, 2, 4, 8, 16.7, 33.3)  # 直方图各桶上限（毫秒），最后一桶为 33.3 以上
+HISTOGRAM_LABELS = ('<1', '<2', '<4', '<8', '<17', '<33', '33+')
+HUD_REFRESH = 15  # HUD 文字每隔多少帧重新排版一次
+
+
+def percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+class FrameProfiler:
+    """分阶段帧计时器：stages 为阶段名（按主循环中的顺序）"""
+    def __init__(self, stages, window=300, log_path=None):
+        self.stages = tuple(stages)
+        self.samples = {name: deque(maxlen=window) for name in self.stages + ('total',)}
+        self.hud = False
+        self.frame = 0
+        self._current = {}
+        self._active = False  # 本帧是否在计时（帧中途开关 HUD 时从下一帧才开始）
+        self._start = self._last = 0.0
+        self._log = None
+        self._hud_surface = None
+        self._font = None
+        self.counters = {}  # 名称 -> 最新值，显示在 HUD 末尾
+        if log_path:
+            self.open_log(log_path)
+
+    @property
+    def enabled(self):
+        return self.hud or self._log is not None
+
+    def open_log(self, path):
+        """开始把每帧样本写入 path（.jsonl 为 JSON Lines，否则为 CSV）"""
+        self.close_log()
+        self._log = open(path, 'w', encoding='utf-8')
+        self._jsonl = path.endswith('.jsonl')
+        if not self._jsonl:
+            self._log.write(','.join(('frame',) + self.stages + ('total',)) + '\n')
+
+    def close_log(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def toggle_hud(self):
+        self.hud = not self.hud
+        self._hud_surface = None
+
+    def set_counter(self, name, value):
+        """更新 HUD 上显示的计数"""
+        self.counters[name] = value
+
+    def begin_frame(self):
+        self._active = self.enabled
+        if not self._active:
+            return
+        self._start = self._last = time.perf_counter()
+        self._current = {}
+
+    def mark(self, stage):
+        """记录从上一个标记（或帧开始）到现在的耗时，计入 stage"""
+        if not self._active:
+            return
+        now = time.perf_counter()
+        self._current[stage] = self._current.get(stage, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self):
+        self.frame += 1
+        if not self._active:
+            return
+        self._active = False
+        total = (time.perf_counter() - self._start) * 1000
+        row = [self._current.get(name, 0.0) for name in self.stages]
+        for name, value in zip(self.stages, row):
+            self.samples[name].append(value)
+        self.samples['total'].append(total)
+        if self._log is not None:
+            if self._jsonl:
+                record = dict(zip(self.stages, (round(v, 4) for v in row)),
+                              frame=self.frame, total=round(total, 4))
+                self._log.write(json.dumps(record) + '\n')
+            else:
+                self._log.write(f"{self.frame}," + ','.join(f'{v:.4f}' for v in row + [total]) + '\n')
+
+    def histogram(self, stage):
+        """stage 最近样本落在各耗时区间的帧数"""
+        counts = [0] * (len(HISTOGRAM_EDGES) + 1)
+        for value in self.samples[stage]:
+            i = 0
+            while i < len(HISTOGRAM_EDGES) and value > HISTOGRAM_EDGES[i]:
+                i += 1
+            counts[i] += 1
+        return counts
+
+    def _render_hud(self):
+        if self._font is None:
+            pygame.font.init()  # 场景只初始化了显示子系统，字体模块在第一次画 HUD 时才初始化
+            self._font = pygame.font.SysFont('monospace', 14)
+        lines = [f"{'stage':<10}{'mean':>7}{'p50':>7}{'p99':>7}  " + ' '.join(HISTOGRAM_LABELS) + ' ms']
+        for name in self.stages + ('total',):
+            values = self.samples[name]
+            if not values:
+                continue
+            ordered = sorted(values)
+            counts = self.histogram(name)
+            peak = max(counts) or 1
+            bars = ' '.join(' .:-=+*#@'[round(c / peak * 8)].center(len(label))
+                            for c, label in zip(counts, HISTOGRAM_LABELS))
+            lines.append(f"{name:<10}{sum(values) / len(values):>7.2f}{percentile(ordered, 50):>7.2f}"
+                         f"{percentile(ordered, 99):>7.2f}  {bars}")
+        total = self.samples['total']
+        if total:
+            lines.append(f"budget {FRAME_BUDGET_MS:.1f} ms, used {sum(total) / len(total) / FRAME_BUDGET_MS:.0%}")
+        for name, value in self.counters.items():
+            lines.append(f"{name:<10}{value:>7}")
+        rendered = [self._font.render(line, True, (230, 230, 230)) for line in lines]
+        width = max(r.get_width() for r in rendered) + 12
+        height = sum(r.get_height() for r in rendered) + 12
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        y = 6
+        for r in rendered:
+            surface.blit(r, (6, y))
+            y += r.get_height()
+        self._hud_surface = surface
+
+    def draw_hud(self, target):
+        """HUD 打开时画到 target 左上角，返回画到的矩形（未打开返回 None）"""
+        if not self.hud:
+            return None
+        if self._hud_surface is None or self.frame % HUD_REFRESH == 0:
+            self._render_hud()
+        return target.blit(self._hud_surface, (10, 10))
@@ -0,0 +1,85 @@
+"""
+跳动的心形（pygame）
+HeartLayer 把心形引擎、帧的生成方式（流式 / 预计算、磁盘缓存、多进程）和绘制方式组合在一起，
+dad.py、ceshi.py 和基准测试共用，不再各自复制一份 Heart 类。
+帧以心形中心为原点生成，与画面尺寸无关：同一组帧（和同一份磁盘缓存）适用于任何分辨率，
+绘制时才缩放、平移到目标画面的中心，窗口尺寸或内部分辨率变化时立即生效，不必重新生成。
+"""
+import numpy as np
+import pygame
+
+from .frame_cache import FrameCache
+from .heart_engine import HeartEngine, StreamedFrames, precompute_frames, visible_points
+from .heart_raster import FrameRaster, points_rect, scale_points
+
+HEART_COLOR = (255, 105, 180)  # 粉红色
+
+
+class HeartLayer:
+    """以画面中心为心形中心的一组逐帧点集
+    stream：先算好第 0 帧，其余帧后台线程补齐；否则用 workers 个进程一次预计算完。
+    seed 固定且 cache 为 True 时帧存进磁盘缓存，下次启动直接内存映射。
+    render_mode：'surface' 每帧预光栅化后整张 blit（画面外的部分由 blit 裁掉）；'rect' 逐点 draw.rect。
+    culling：'rect' 模式下跳过完全落在画面外的点。
+    scale：点坐标到画面坐标的缩放倍数（内部分辨率降档时改它，不重新生成帧）。
+    """
+    def __init__(self, colour=HEART_COLOR, enlarge=11, seed=1314, points=800,
+                 generate_frame=30, frame_skip=3, cache=True, stream=True, workers=1,
+                 render_mode='surface', culling=True, scale=1.0):
+        self.engine = HeartEngine(0, 0, enlarge, seed=seed)
+        self.colour = colour
+        self.generate_frame = generate_frame
+        self.frame_skip = frame_skip  # 每隔几次 draw 换下一帧（值越大，跳动越慢）
+        self.render_mode = render_mode
+        cache = FrameCache() if cache else None
+        if stream:
+            self.all_points = StreamedFrames(self.engine, points, generate_frame, cache)
+        else:
+            self.all_points = precompute_frames(self.engine, points, generate_frame, cache, workers)
+        self.culling = culling
+        self.raster = FrameRaster(colour, scale=scale)
+        self.frame = 0
+        self._counter = 0
+        self._last = None  # 上一次 render 的 (帧, 画面尺寸)，供 culled 统计
+
+    @property
+    def scale(self):
+        return self.raster.scale
+
+    @scale.setter
+    def scale(self, scale):
+        self.raster.set_scale(scale)
+
+    def _place(self, points, width, height):
+        """把以心形中心为原点的点映射到 width×height 画面上：缩放（与光栅化相同）后平移到画面中心"""
+        return scale_points(points, self.scale) + np.array((width // 2, height // 2, 0))
+
+    @property
+    def culled(self):
+        """上一次画的帧中完全落在画面外的点数"""
+        if self._last is None:
+            return 0
+        points, (width, height) = self._last
+        return len(points) - len(visible_points(self._place(points, width, height), width, height))
+
+    def render(self, screen, frame):
+        """把指定帧画到 screen 的中心，返回画到的矩形"""
+        points = self.all_points[frame % self.generate_frame]
+        width, height = screen.get_size()
+        self._last = (points, (width, height))
+        if self.render_mode == 'surface':
+            return self.raster.draw(screen, points, (width // 2, height // 2))
+        points = self._place(points, width, height)
+        if self.culling:
+            points = visible_points(points, width, height)
+        for x, y, size in points.tolist():
+            pygame.draw.rect(screen, self.colour, (x, y, size, size))
+        return points_rect(points)
+
+    def draw(self, screen):
+        """主循环每帧调用一次：按 frame_skip 推进动画并画出当前帧，返回画到的矩形"""
+        self._counter += 1
+        if self._counter >= self.frame_skip:
+            self.frame += 1
+            self._counter = 0
+        return self.render(screen, self.frame)
@@ -0,0 +1,356 @@
+"""
+心形动画的 NumPy 向量化引擎
+原始点、边缘扩散点、中心扩散点各保存为一个 (N, 2) 数组（结构数组），
+每一帧（含光晕点）用批量数组运算一次算完，代替逐点调用 heart_function / calc_position。
+xin.py、dad.py、ceshi.py 共用这份实现，只是参数不同。
+每一帧使用由种子和帧号派生的独立随机数流，帧与帧互不依赖，
+因此可以按任意顺序、在多个进程中并行计算，结果与顺序计算完全相同。
+算好的帧按绘制时的截断规则转成 int16 存储（每点 6 字节，原来 float64 为 24 字节），
+预计算的所有帧拼接成一块连续数组（PackedFrames），帧数上百也只占几十 MB 以内。
+"""
+import copy
+import multiprocessing
+import os
+import threading
+from math import sin, pi
+from multiprocessing import shared_memory
+
+import numpy as np
+
+HALO_ENLARGE = -15  # 光晕曲线的放大倍数（负数表示翻转）
+HALO_OFFSETS = np.array([(0, 0), (20, 20), (-20, -20), (20, -20), (-20, 20)], dtype=np.float64)
+POINT_DTYPE = np.int16  # 存储帧点 (x, y, size) 的类型
+
+
+def curve(p):
+    """动画曲线函数，控制心形收缩扩张节奏"""
+    return 2 * (2 * sin(4 * p)) / (2 * pi)
+
+
+def heart_function(t, shrink_ratio, center_x, center_y):
+    """批量生成心形曲线上的点（t 为数组），取整为整数坐标
+    向下取整：画面内（坐标为正）与原版的截断相同，且中心平移整数像素时结果只是跟着平移"""
+    x = 17 * (np.sin(t) ** 3)
+    y = -(16 * np.cos(t) - 5 * np.cos(2 * t) - 2 * np.cos(3 * t) - np.cos(4 * t))
+    x = np.floor(x * shrink_ratio + center_x)
+    y = np.floor(y * shrink_ratio + center_y)
+    return np.column_stack((x, y))
+
+
+def scatter_inside(points, beta, rng, center_x, center_y):
+    """在原始点周围批量生成扩散点（内部填充用）"""
+    # 1 - random() 落在 (0, 1]，避免 log(0)
+    ratio = -beta * np.log(1.0 - rng.random(points.shape))
+    offset = points - (center_x, center_y)
+    return points - ratio * offset
+
+
+def shrink(points, ratio, center_x, center_y):
+    """批量收缩点坐标（用于光晕效果）"""
+    offset = points - (center_x, center_y)
+    force = -1 / (np.einsum('ij,ij->i', offset, offset) ** 0.6)
+    return points - ratio * force[:, None] * offset
+
+
+def calc_position(points, ratio, rng, center_x, center_y):
+    """批量计算动态点位置（带 -1~1 的随机整数扰动）"""
+    offset = points - (center_x, center_y)
+    force = 1 / (np.einsum('ij,ij->i', offset, offset) ** 0.420)
+    jitter = rng.integers(-1, 2, size=points.shape)
+    return points - (ratio * force[:, None] * offset + jitter)
+
+
+def unique_rows(points):
+    """按行去重并保持首次出现的顺序（对应原版 set 去重）"""
+    _, index = np.unique(points, axis=0, return_index=True)
+    return points[np.sort(index)]
+
+
+def visible_points(points, width, height):
+    """只保留至少有一个像素落在 [0, width)×[0, height) 内的 (x, y, size) 点
+    坐标像 pygame.draw.rect 一样向零截断后判断"""
+    x = np.trunc(points[:, 0])
+    y = np.trunc(points[:, 1])
+    size = points[:, 2]
+    keep = (x + size > 0) & (y + size > 0) & (x < width) & (y < height)
+    return points[keep]
+
+
+def pack_points(points):
+    """把 calc 算出的 (M, 3) 浮点点集转成 POINT_DTYPE：坐标向下取整，
+    画面内与 pygame.draw.rect 的截断相同；以心形中心为原点的帧平移整数像素后也与直接按画面坐标算的一致
+    （超出 int16 范围的坐标本来就在画面外，夹到边界）"""
+    info = np.iinfo(POINT_DTYPE)
+    return np.floor(points).clip(info.min, info.max).astype(POINT_DTYPE)
+
+
+class PackedFrames:
+    """所有帧的点拼接成一块连续的 (总点数, 3) 数组 data，offsets[i]:offsets[i + 1] 为第 i 帧
+    按下标取帧返回预先切好的视图：同一帧总是同一个对象（FrameRaster 以它为缓存键），不复制数据。
+    data 可以是磁盘缓存的内存映射。"""
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+        self._views = [data[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+    @classmethod
+    def pack(cls, frames):
+        """由各帧的点集（浮点或已 pack_points 的）拼接"""
+        frames = [f if f.dtype == POINT_DTYPE else pack_points(f) for f in frames]
+        offsets = np.zeros(len(frames) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(f) for f in frames])
+        return cls(np.concatenate(frames), offsets)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.offsets.nbytes
+
+    def __len__(self):
+        return len(self._views)
+
+    def __getitem__(self, frame):
+        return self._views[frame]
+
+    def __iter__(self):
+        return iter(self._views)
+
+
+def point_mask(points, left, top, width, height):
+    """把 (x, y, size) 点画成 width×height 的布尔掩码，下标为 mask[x, y]
+    坐标像 pygame.draw.rect 一样向零截断，超出范围的像素直接丢弃。
+    """
+    x = np.trunc(points[:, 0]).astype(np.int64) - left
+    y = np.trunc(points[:, 1]).astype(np.int64) - top
+    size = points[:, 2].astype(np.int64)
+    mask = np.zeros((width, height), dtype=bool)
+    for s in np.unique(size):
+        group = size == s
+        gx, gy = x[group], y[group]
+        for dx in range(s):
+            for dy in range(s):
+                px, py = gx + dx, gy + dy
+                inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+                mask[px[inside], py[inside]] = True
+    return mask
+
+
+class HeartEngine:
+    """心形点集与逐帧计算（结构数组版）"""
+    def __init__(self, center_x, center_y, enlarge=11, seed=None,
+                 edge_scatter=2, center_scatter=3000,
+                 ratio_scale=10, period=15, halo_number=(800, 1500), viewport=None):
+        self.center_x = center_x
+        self.center_y = center_y
+        self.enlarge = enlarge
+        self.edge_scatter = edge_scatter  # 每个原始点生成的边缘扩散点数
+        self.center_scatter = center_scatter  # 中心扩散点总数
+        self.ratio_scale = ratio_scale  # 跳动幅度
+        self.period = period  # 跳动周期（帧数）
+        self.halo_number = halo_number  # 光晕点数：(基础值, 随曲线增加的最大值)
+        self.viewport = viewport  # (宽, 高)：给出时每帧只保留落在画面内的点
+        self.seed = seed
+        # seed 为 None 时也固定下一份熵，保证各帧（包括在子进程中算的帧）出自同一个种子
+        self._entropy = np.random.SeedSequence(seed).entropy
+        self.rng = np.random.default_rng(np.random.SeedSequence(self._entropy))  # 仅用于 build()
+        self._points = np.empty((0, 2))  # 原始心形点
+        self._edge_diffusion_points = np.empty((0, 2))  # 边缘扩散点
+        self._center_diffusion_points = np.empty((0, 2))  # 中心扩散点
+
+    def params(self):
+        """决定生成结果的全部参数（用作帧缓存的键）"""
+        return {
+            'center': (self.center_x, self.center_y), 'enlarge': self.enlarge,
+            'seed': self.seed, 'edge_scatter': self.edge_scatter,
+            'center_scatter': self.center_scatter, 'ratio_scale': self.ratio_scale,
+            'period': self.period, 'halo_number': tuple(self.halo_number),
+            'viewport': None if self.viewport is None else tuple(self.viewport),
+        }
+
+    def build(self, number):
+        """构建基础点集（原始点+扩散点）"""
+        center = (self.center_x, self.center_y)
+        t = self.rng.uniform(0, 2 * pi, number)
+        self._points = unique_rows(heart_function(t, self.enlarge, *center))
+
+        edge = np.repeat(self._points, self.edge_scatter, axis=0)
+        self._edge_diffusion_points = unique_rows(scatter_inside(edge, 0.05, self.rng, *center))
+
+        index = self.rng.integers(0, len(self._points), self.center_scatter)
+        inner = scatter_inside(self._points[index], 0.27, self.rng, *center)
+        self._center_diffusion_points = unique_rows(inner)
+
+    def frame_rng(self, frame):
+        """第 frame 帧专用的随机数生成器（只由种子和帧号决定）"""
+        return np.random.default_rng(np.random.SeedSequence(self._entropy, spawn_key=(frame,)))
+
+    def calc(self, frame):
+        """计算指定帧的所有点，返回 (M, 3) 数组，每行为 (x, y, size)
+        设置了 viewport 时，完全落在画面外的点（主要是偏移最远的光晕点）在这里就剔除掉"""
+        center = (self.center_x, self.center_y)
+        rng = self.frame_rng(frame)
+        c = curve(frame / self.period * pi)
+        ratio = self.ratio_scale * c
+        halo_radius = int(4 + 6 * (1 + c))
+        halo_number = int(self.halo_number[0] + self.halo_number[1] * abs(c ** 2))
+
+        # 光晕点：去重后随机偏移，每个点再复制出四个 ±20 像素的偏移点
+        t = rng.uniform(0, 2 * pi, halo_number)
+        halo = heart_function(t, HALO_ENLARGE, *center)
+        halo = unique_rows(shrink(halo, halo_radius, *center))
+        halo += rng.integers(-60, 61, size=halo.shape)
+        halo_size = rng.choice((1, 1, 2), len(halo))
+        halo = (halo[:, None, :] + HALO_OFFSETS).reshape(-1, 2)
+        halo_size = np.repeat(halo_size, len(HALO_OFFSETS))
+
+        # 原始点、边缘扩散点、中心扩散点
+        groups = [(halo, halo_size)]
+        for points, max_size in ((self._points, 3),
+                                 (self._edge_diffusion_points, 2),
+                                 (self._center_diffusion_points, 2)):
+            groups.append((calc_position(points, ratio, rng, *center),
+                           rng.integers(1, max_size + 1, len(points))))
+
+        xy = np.concatenate([g[0] for g in groups])
+        size = np.concatenate([g[1] for g in groups])
+        points = np.column_stack((xy, size))
+        if self.viewport is not None:
+            points = visible_points(points, *self.viewport)
+        return points
+
+
+# 并行预计算：基础点集放进一块共享内存，子进程直接映射读取，不逐个进程复制
+_BASE_SETS = ('_points', '_edge_diffusion_points', '_center_diffusion_points')
+_worker_engine = None
+_worker_memory = None
+
+
+def _init_worker(engine, memory_name, layout):
+    """子进程初始化：engine 为不含点集的副本，点集改为指向共享内存的只读视图"""
+    global _worker_engine, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    for name, offset, shape in layout:
+        view = np.ndarray(shape, dtype=np.float64, buffer=_worker_memory.buf, offset=offset)
+        view.flags.writeable = False
+        setattr(engine, name, view)
+    _worker_engine = engine
+
+
+def _calc_frame(frame):
+    return pack_points(_worker_engine.calc(frame))
+
+
+def _calc_parallel(engine, generate_frame, workers):
+    """用 workers 个进程计算所有帧（engine 须已 build）"""
+    arrays = [getattr(engine, name) for name in _BASE_SETS]
+    memory = shared_memory.SharedMemory(create=True, size=max(1, sum(a.nbytes for a in arrays)))
+    try:
+        layout = []
+        offset = 0
+        for name, array in zip(_BASE_SETS, arrays):
+            np.ndarray(array.shape, dtype=np.float64, buffer=memory.buf, offset=offset)[...] = array
+            layout.append((name, offset, array.shape))
+            offset += array.nbytes
+        shell = copy.copy(engine)
+        for name in _BASE_SETS:
+            setattr(shell, name, None)
+        # 用 spawn 启动：场景在打开窗口之后才建心形，fork 会把已初始化的 SDL 和显示连接复制进子进程；
+        # 点集已在共享内存里，子进程只需重新导入模块
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(workers, _init_worker, (shell, memory.name, layout)) as pool:
+            return pool.map(_calc_frame, range(generate_frame), chunksize=1)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def _cache_key(engine, number, generate_frame, cache):
+    """引擎设置了随机种子且提供了缓存时返回缓存键，否则返回 None"""
+    if cache is None or engine.seed is None:
+        return None
+    return cache.make_key(number=number, generate_frame=generate_frame, **engine.params())
+
+
+def _load_frames(cache, key):
+    entry = cache.load(key)
+    return None if entry is None else PackedFrames(*entry)
+
+
+def _store_frames(cache, key, frames):
+    try:
+        cache.store(key, frames.data, frames.offsets)
+    except OSError as e:
+        print(f"心形帧缓存写入失败: {e}")
+
+
+def precompute_frames(engine, number, generate_frame, cache=None, workers=1):
+    """构建点集并预计算所有帧
+    引擎设置了随机种子且提供了 cache（FrameCache）时，优先从磁盘缓存读取，
+    未命中则计算后写入缓存，下次启动直接内存映射。
+    workers 大于 1 时用多进程并行计算各帧（None 表示使用全部 CPU 核心），结果与单进程相同。
+    返回 PackedFrames。
+    """
+    key = _cache_key(engine, number, generate_frame, cache)
+    if key is not None:
+        frames = _load_frames(cache, key)
+        if frames is not None:
+            return frames
+    engine.build(number)
+    workers = min(workers or os.cpu_count() or 1, generate_frame)
+    if workers > 1:
+        frames = PackedFrames.pack(_calc_parallel(engine, generate_frame, workers))
+    else:
+        frames = PackedFrames.pack([pack_points(engine.calc(frame)) for frame in range(generate_frame)])
+    if key is not None:
+        _store_frames(cache, key, frames)
+    return frames
+
+
+class StreamedFrames:
+    """流式生成的帧序列：第 0 帧同步算好，其余帧由后台线程依次生成
+    按下标取帧时，若该帧尚未完成，退回到循环距离最近的已完成帧，
+    因此可以直接替代 Heart.all_points 使用，启动耗时不再随帧数增长。
+    生成中的每帧各自是一个 int16 数组（逐帧追加，已取出的帧对象保持不变），
+    从磁盘缓存读取时为 PackedFrames。
+    """
+    def __init__(self, engine, number, generate_frame, cache=None):
+        self.generate_frame = generate_frame
+        self.ready = 0  # 已完成的帧数（帧按 0, 1, 2... 顺序生成）
+        self._engine = engine
+        self._cache = cache
+        self._key = _cache_key(engine, number, generate_frame, cache)
+        self._thread = None
+        if self._key is not None:
+            frames = _load_frames(cache, self._key)
+            if frames is not None:
+                self._frames = frames
+                self.ready = generate_frame
+                return
+        engine.build(number)
+        self._frames = [pack_points(engine.calc(0))] + [None] * (generate_frame - 1)
+        self.ready = 1
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        for frame in range(1, self.generate_frame):
+            self._frames[frame] = pack_points(self._engine.calc(frame))
+            self.ready = frame + 1
+        if self._key is not None:
+            _store_frames(self._cache, self._key, PackedFrames.pack(self._frames))
+
+    def wait(self, timeout=None):
+        """阻塞直到所有帧生成完毕（或超时），返回是否已全部完成"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready == self.generate_frame
+
+    def __len__(self):
+        return self.generate_frame
+
+    def __getitem__(self, frame):
+        frame %= self.generate_frame
+        ready = self.ready
+        if frame >= ready:
+            # 尚未生成：在最后完成的帧和第 0 帧（循环相邻）中取较近者
+            frame = ready - 1 if frame - (ready - 1) <= self.generate_frame - frame else 0
+        return self._frames[frame]
@@ -0,0 +1,91 @@
+"""
+心形帧的预光栅化渲染（pygame）
+每一帧的点只在第一次用到时画进一张缓存的 Surface，之后每帧只需一次 blit，
+代替每个点一次 pygame.draw.rect。
+为控制内存，缓存的 Surface 只覆盖心形点的外接矩形，并使用 8 位调色板格式
+（索引 0 为透明色键，索引 1 为心形颜色），每像素只占 1 字节；
+缓存总量超过 max_bytes 时淘汰最久未用的帧（帧数上百时不再随帧数无限增长，淘汰的帧用到时重新光栅化）。
+缓存的 Surface 与画到哪里无关：draw 时给出平移量，同一份缓存可以画到任意尺寸画面的任意位置。
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from .heart_engine import point_mask
+
+
+def points_rect(points):
+    """一帧 (x, y, size) 点的外接矩形 (left, top, width, height)"""
+    # pygame.draw.rect 对浮点坐标向零截断，这里保持一致
+    x = np.trunc(points[:, 0])
+    y = np.trunc(points[:, 1])
+    left, top = int(x.min()), int(y.min())
+    width = int((x + points[:, 2]).max()) - left
+    height = int((y + points[:, 2]).max()) - top
+    return left, top, max(width, 1), max(height, 1)
+
+
+def scale_points(points, scale):
+    """把一帧 (x, y, size) 点缩放 scale 倍：坐标向下取整，边长四舍五入且至少 1 像素
+    （'surface' 和 'rect' 两种绘制方式共用，缩放后画出的像素相同，小点不会缩没）"""
+    if scale == 1:
+        return points
+    scaled = np.floor(points * scale)
+    scaled[:, 2] = np.maximum(1, np.round(points[:, 2] * scale))
+    return scaled.astype(points.dtype)
+
+
+def rasterize(points, colour, scale=1.0):
+    """把一帧 (x, y, size) 点画进裁剪后的 8 位 Surface，返回 (surface, 左上角坐标)
+    scale 不为 1 时先用 scale_points 缩放各点再画"""
+    points = scale_points(points, scale)
+    left, top, width, height = points_rect(points)
+
+    surface = pygame.Surface((width, height), 0, 8)
+    surface.set_palette_at(0, (0, 0, 0))
+    surface.set_palette_at(1, colour)
+    pixels = pygame.surfarray.pixels2d(surface)
+    pixels[:] = point_mask(points, left, top, width, height)
+    del pixels  # 释放像素数组对 Surface 的锁定
+    # 点很稀疏，RLE 加速的色键 blit 只处理非透明像素
+    surface.set_colorkey(0, pygame.RLEACCEL)
+    return surface, (left, top)
+
+
+class FrameRaster:
+    """按帧缓存光栅化结果；缓存以帧数组本身为键，流式生成中的占位帧不会被误存
+    scale 为点坐标到画面坐标的缩放倍数（内部分辨率降档时用），改变时已缓存的帧作废"""
+    def __init__(self, colour, max_bytes=64 * 1024 * 1024, scale=1.0):
+        self.colour = colour
+        self.max_bytes = max_bytes
+        self.scale = scale
+        self._surfaces = OrderedDict()
+        self._bytes = 0
+
+    def set_scale(self, scale):
+        """改变缩放倍数；之后各帧用到时按新倍数重新光栅化"""
+        if scale != self.scale:
+            self.scale = scale
+            self._surfaces.clear()
+            self._bytes = 0
+
+    def draw(self, target, points, offset=(0, 0)):
+        """把一帧画到 target 上（缩放后再平移 offset），返回画到的矩形"""
+        entry = self._surfaces.get(id(points))
+        if entry is None:
+            # 同时保存 points 的引用，保证 id 在缓存期间不会被复用
+            entry = (points,) + rasterize(points, self.colour, self.scale)
+            self._surfaces[id(points)] = entry
+            self._bytes += entry[1].get_pitch() * entry[1].get_height()
+            while self._bytes > self.max_bytes and len(self._surfaces) > 1:
+                _, old = self._surfaces.popitem(last=False)
+                self._bytes -= old[1].get_pitch() * old[1].get_height()
+        else:
+            self._surfaces.move_to_end(id(points))
+        left, top = entry[2]
+        return target.blit(entry[1], (left + offset[0], top + offset[1]))
+
+    def memory_bytes(self):
+        """已缓存 Surface 的像素内存（字节）"""
+        return sum(e[1].get_pitch() * e[1].get_height() for e in self._surfaces.values())
@@ -0,0 +1,110 @@
+"""
+多进程烟花粒子模拟
+ShardedParticleSystem 与 ParticleSystem 接口相同：按烟花 id 把爆炸粒子分到 workers 个子进程（分片），
+每个分片的粒子数组建在一块 SharedMemory 里（ParticleSystem 的 buffer 模式），
+子进程负责生成和推进粒子，主进程直接在同一块内存上构造只读视图来绘制，不拷贝任何粒子数据。
+每帧 update 把本帧的爆炸随 step 消息发给所有分片，等全部分片回复后才绘制（逐帧同步），
+画面与单进程时一样只会看到完整的一帧。升空中的烟花弹数量很少，仍在主进程里更新。
+各分片的随机数由同一个 Generator 派生，同样的种子和分片数逐位复现（与单进程的结果不同）。
+"""
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pygame
+
+from .firework_engine import DEFAULT_CAPACITY, ParticleSystem
+
+
+class ShardedParticleSystem:
+    """workers 个子进程分片模拟的 ParticleSystem；capacity 为每个分片的固定容量"""
+    def __init__(self, workers, capacity=DEFAULT_CAPACITY, seed=None, sprites=None, fade=None, viewport=None):
+        self.sprites = sprites
+        self.fade = fade
+        self.viewport = viewport
+        self.circle = pygame.draw.circle if sprites is None else sprites.draw
+        self.culled = 0
+        self.retired_offscreen = 0
+        self.count = 0
+        self._live = {}
+        self._pending = [[] for _ in range(workers)]  # 每个分片本帧待生成的爆炸
+        self._memory = []
+        self._views = []  # 主进程里每个分片的只读视图（只用来绘制）
+        self._pipes = []
+        self._processes = []
+        context = multiprocessing.get_context('spawn')
+        generators = np.random.default_rng(seed).spawn(workers)
+        for generator in generators:
+            memory = SharedMemory(create=True, size=ParticleSystem.buffer_size(capacity))
+            view = ParticleSystem(capacity, sprites=sprites, fade=fade, buffer=memory.buf)
+            pipe, child = context.Pipe()
+            process = context.Process(target=_run_shard, daemon=True,
+                                      args=(child, memory.name, capacity, generator, viewport))
+            process.start()
+            self._memory.append(memory)
+            self._views.append(view)
+            self._pipes.append(pipe)
+            self._processes.append(process)
+
+    def spawn(self, owner, x, y, amount, colours, style):
+        """爆炸留到本帧 update 时交给 owner 所在的分片生成"""
+        self._pending[owner % len(self._pending)].append((owner, x, y, amount, colours, style))
+
+    def update(self):
+        """所有分片前进一帧：并行推进，全部完成后才返回"""
+        for pipe, pending in zip(self._pipes, self._pending):
+            pipe.send((pending, self.viewport))
+        self._pending = [[] for _ in self._pending]
+        live = {}
+        count = retired = 0
+        for pipe, view in zip(self._pipes, self._views):
+            view.count, view.head, shard_live, shard_retired = pipe.recv()
+            live.update(shard_live)
+            count += view.count
+            retired += shard_retired
+        self._live = live
+        self.count = count
+        self.retired_offscreen = retired
+
+    def show(self, win):
+        for view in self._views:
+            view.show(win)
+        self.culled = sum(view.culled for view in self._views)
+
+    def mark_dirty(self, dirty):
+        for view in self._views:
+            view.mark_dirty(dirty)
+
+    def live_count(self, owner):
+        return self._live.get(owner, 0)
+
+    def close(self):
+        """结束子进程并释放共享内存"""
+        for pipe in self._pipes:
+            pipe.send(None)
+        for process in self._processes:
+            process.join(1.0)
+            if process.is_alive():
+                process.terminate()
+        self._views = []  # 先丢掉指向共享内存的数组，才能关闭
+        for memory in self._memory:
+            memory.close()
+            memory.unlink()
+        self._memory = []
+
+
+def _run_shard(pipe, name, capacity, seed, viewport):
+    """分片子进程：接收本帧的爆炸，生成后推进一帧，回复粒子数、写入位置和存活计数"""
+    memory = SharedMemory(name=name)
+    system = ParticleSystem(capacity, seed, buffer=memory.buf)
+    while True:
+        message = pipe.recv()
+        if message is None:
+            break
+        spawns, system.viewport = message
+        for args in spawns:
+            system.spawn(*args)
+        system.update()
+        pipe.send((system.count, system.head, system._live, system.retired_offscreen))
+    del system
+    memory.close()
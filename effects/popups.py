@@ -0,0 +1,230 @@
+"""
+tkinter 提示弹窗
+TipPopups 每隔 interval 毫秒在屏幕随机位置弹出一个提示窗口，1~3 秒后自动关闭，
+弹满 max_total 个且全部关闭后弹出最后一个居中的窗口。
+提示窗口由 TipWindowPool 复用：关闭只是 withdraw，下一条提示改文字、颜色和位置后重新显示。
+Tk 根窗口在第一次弹窗时才创建（tkinter 也在那时才导入），不弹窗的场景不付出这部分开销。
+PopupProcess 接口相同，但把 TipPopups 和它自己的 Tk mainloop 放进独立进程：
+主循环只往队列里放一条消息，建窗口、处理 Tk 事件都不再占用渲染线程的帧时间。
+"""
+import multiprocessing
+from queue import Empty
+
+TIPS = [
+    '多喝水哦~', '保持微笑呀', '每天都要元气满满',
+    '记得吃水果', '保持好心情', '好好爱自己',
+    '梦想成真', '期待下一次见面', '顺顺利利', '早点休息',
+    '愿所有烦恼都消失', '别熬夜', '今天过得开心嘛', '天冷了，多穿衣服'
+]
+BG_COLORS = [
+    'lightpink', 'skyblue', 'lightgreen', 'lavender',
+    'lightyellow', 'plum', 'coral', 'bisque', 'aquamarine',
+    'mistyrose', 'honeydew', 'lavenderblush', 'oldlace'
+]
+WINDOW_WIDTH = 300
+WINDOW_HEIGHT = 90
+
+
+class TipWindowPool:
+    """可复用的提示窗口
+    最多创建 size 个 Toplevel + Label（prefill 为 True 时一次建好），关闭的窗口 withdraw 后收回池中，
+    再次弹出时只改文字、颜色和位置再 deiconify，不再为每条提示新建、销毁原生窗口。
+    """
+    def __init__(self, root, size, width=WINDOW_WIDTH, height=WINDOW_HEIGHT,
+                 font=('微软雅黑', 16), alpha=None, prefill=False):
+        import tkinter as tk
+        self._tk = tk
+        self.root = root
+        self.size = size
+        self.width = width
+        self.height = height
+        self.font = font
+        self.alpha = alpha
+        self.created = 0
+        self.free = []  # 空闲的 (窗口, 标签)
+        if prefill:
+            self.free = [self._create() for _ in range(size)]
+
+    def _create(self):
+        tk = self._tk
+        window = tk.Toplevel(self.root)
+        window.withdraw()
+        window.title('温馨提示')
+        window.attributes('-topmost', True)
+        window.protocol('WM_DELETE_WINDOW', window.withdraw)  # 手动关掉的窗口也只是隐藏，到时照常收回
+        if self.alpha is not None:
+            window.attributes('-alpha', self.alpha)
+        label = tk.Label(window, font=self.font, width=30, height=3)
+        label.pack()
+        self.created += 1
+        return window, label
+
+    def show(self, text, bg, x, y):
+        """在 (x, y) 处弹出一个窗口，返回 (窗口, 标签)；size 个窗口都在显示时返回 None"""
+        if self.free:
+            entry = self.free.pop()
+        elif self.created < self.size:
+            entry = self._create()
+        else:
+            return None
+        window, label = entry
+        label.configure(text=text, bg=bg)
+        window.geometry(f"{self.width}x{self.height}+{x}+{y}")
+        window.deiconify()
+        return entry
+
+    def hide(self, entry):
+        """收回 show 返回的窗口"""
+        entry[0].withdraw()
+        self.free.append(entry)
+
+
+class TipPopups:
+    """screen_size 为屏幕尺寸，rng 为 RandomStream（位置、文字、颜色、关闭延时）
+    提示窗口取自 max_visible 个窗口的 TipWindowPool，最后的居中窗口单独新建"""
+    def __init__(self, screen_size, rng, tips=TIPS, colors=BG_COLORS,
+                 interval=200, max_total=30, max_visible=8):
+        self.width, self.height = screen_size
+        self.rng = rng
+        self.tips = tips
+        self.colors = colors
+        self.interval = interval  # 弹窗间隔（毫秒）
+        self.max_total = max_total
+        self.max_visible = max_visible
+        self.windows = []
+        self.created = 0
+        self.final_created = False
+        self.root = None
+        self.pool = None
+        self._tk = None
+        self._last = 0
+
+    def _root(self):
+        if self.root is None:
+            import tkinter as tk
+            self._tk = tk
+            self.root = tk.Tk()
+            self.root.withdraw()
+            self.pool = TipWindowPool(self.root, self.max_visible, alpha=0.9)
+        return self.root
+
+    def step(self, now):
+        """主循环每帧调用，now 为毫秒时间戳：到了间隔就弹出一个窗口"""
+        if now - self._last > self.interval:
+            self.create_tip()
+            self._last = now
+
+    def create_tip(self):
+        if (self.final_created
+                or self.created >= self.max_total
+                or len(self.windows) >= self.max_visible):
+            return
+        rng = self.rng
+        x = rng.randint(20, self.width - WINDOW_WIDTH - 20)
+        y = rng.randint(20, self.height - WINDOW_HEIGHT - 20)
+        try:
+            self._root()
+            entry = self.pool.show(rng.choice(self.tips), rng.choice(self.colors), x, y)
+            self.windows.append(entry)
+            self.created += 1
+            entry[0].after(rng.randint(1000, 3000), lambda: self._close(entry))
+        except Exception as e:
+            print(f"弹窗创建失败: {e}")
+
+    def _close(self, entry):
+        if entry in self.windows:
+            self.windows.remove(entry)
+            self.pool.hide(entry)
+        if not self.windows and not self.final_created:
+            self.final_created = True
+            self.create_final()
+
+    def create_final(self):
+        tk = self._tk
+        x = (self.width - WINDOW_WIDTH) // 2
+        y = (self.height - WINDOW_HEIGHT) // 2
+        window = tk.Toplevel(self._root())
+        window.title('温馨提示')
+        window.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}+{x}+{y}")
+        window.attributes('-topmost', True)
+        tk.Label(
+            window,
+            text='我想你了',
+            bg='lightpink',
+            font=('微软雅黑', 18, 'bold'),
+            width=30,
+            height=3
+        ).pack()
+
+    def update(self):
+        """处理 Tk 事件（还没弹过窗时什么也不做）"""
+        if self.root is not None:
+            self.root.update_idletasks()
+            self.root.update()
+
+    def close(self):
+        if self.root is not None:
+            self.root.destroy()
+            self.root = None
+
+
+class PopupProcess:
+    """在独立进程中运行的 TipPopups（参数相同）
+    子进程用 spawn 方式启动（不继承主进程的 SDL / X 连接），以自己的节奏运行 Tk mainloop，
+    每 poll_ms 毫秒取一次队列中的消息；主循环的 step / close 只做不阻塞的 put。
+    子进程启动失败（例如没有图形界面）时错误打印在子进程中，主循环照常运行。
+    """
+    def __init__(self, screen_size, rng, poll_ms=15, **options):
+        self.interval = options.get('interval', 200)
+        self._last = 0
+        context = multiprocessing.get_context('spawn')
+        self._queue = context.Queue()
+        self._process = context.Process(target=_run_popups, daemon=True,
+                                        args=(self._queue, screen_size, rng, poll_ms, options))
+        self._process.start()
+
+    def step(self, now):
+        """主循环每帧调用，now 为毫秒时间戳：到了间隔就通知子进程弹出一个窗口"""
+        if now - self._last > self.interval:
+            self._send('tip')
+            self._last = now
+
+    def _send(self, message):
+        if self._process.is_alive():
+            self._queue.put_nowait(message)
+
+    def update(self):
+        """Tk 事件由子进程自己的 mainloop 处理，这里什么也不做（与 TipPopups 接口一致）"""
+
+    def close(self, timeout=1.0):
+        self._send('close')
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._queue.close()
+
+
+def _run_popups(queue, screen_size, rng, poll_ms, options):
+    """PopupProcess 子进程的入口"""
+    popups = TipPopups(screen_size, rng, **options)
+    try:
+        root = popups._root()
+    except Exception as e:
+        print(f"弹窗进程启动失败: {e}")
+        return
+
+    def poll():
+        while True:
+            try:
+                message = queue.get_nowait()
+            except Empty:
+                break
+            if message == 'close':
+                root.quit()
+                return
+            popups.create_tip()
+        root.after(poll_ms, poll)
+
+    root.after(poll_ms, poll)
+    root.mainloop()
+    popups.close()
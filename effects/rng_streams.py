@@ -0,0 +1,68 @@
+"""
+按子系统划分的随机数流
+一个种子经 SeedSequence 按名字为每个子系统（烟花发射、爆炸粒子、弹窗……）派生一条独立的流，
+某个子系统多取或少取随机数不会影响其他子系统，同一种子的两次运行逐位相同。
+RandomStream 每次用 NumPy 成块生成一批随机数缓存起来，逐个取用时只是一次列表下标访问，
+代替每次调用 random.randint / random.choice 等解释器层面的函数；
+整批取用的向量化代码（如 ParticleSystem）直接使用 generator() 返回的 NumPy Generator。
+"""
+import zlib
+
+import numpy as np
+
+BLOCK_SIZE = 4096  # RandomStream 每次预生成的随机数个数
+
+
+def _spawn_key(name):
+    # 用 crc32 而不是 hash()：字符串的 hash 每次启动都不同
+    return (zlib.crc32(name.encode('utf-8')),)
+
+
+class RandomStreams:
+    """由一个种子派生的各子系统随机数流；seed 为 None 时使用系统熵（但同一次运行内仍可复现）"""
+    def __init__(self, seed=None):
+        self.seed = seed
+        self._entropy = np.random.SeedSequence(seed).entropy
+        self._streams = {}
+
+    def seed_sequence(self, name):
+        return np.random.SeedSequence(self._entropy, spawn_key=_spawn_key(name))
+
+    def generator(self, name):
+        """子系统 name 的 NumPy Generator（每次调用返回一个从头开始的新生成器）"""
+        return np.random.default_rng(self.seed_sequence(name))
+
+    def stream(self, name, block=BLOCK_SIZE):
+        """子系统 name 的 RandomStream（同一名字返回同一个对象）"""
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = self._streams[name] = RandomStream(self.seed_sequence(name), block)
+        return stream
+
+
+class RandomStream:
+    """成块预生成的随机数流，提供 random 模块中常用的几个函数"""
+    def __init__(self, seed=None, block=BLOCK_SIZE):
+        self.generator = np.random.default_rng(seed)
+        self.block = block
+        self._buffer = []
+        self._index = 0
+
+    def random(self):
+        """[0, 1) 内的浮点数"""
+        i = self._index
+        if i == len(self._buffer):
+            self._buffer = self.generator.random(self.block).tolist()
+            i = 0
+        self._index = i + 1
+        return self._buffer[i]
+
+    def randint(self, a, b):
+        """[a, b] 内的整数"""
+        return a + int(self.random() * (b - a + 1))
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
@@ -0,0 +1,204 @@
+"""
+虚拟提示弹窗（pygame）
+不创建任何原生窗口：提示框（背景色 + 文字）直接画在主画面上，同时存在几千个也只是一次 blits。
+每种（提示语, 颜色）的提示框只渲染一次并缓存；所有提示的寿命由一个时间轮统一管理，
+代替每个窗口一个 after() 回调，每帧只检查经过的格子里到期的提示。
+提示框叠起来超过 LAYER_DEPTH 层屏幕面积时改用提示层：所有提示框先合成到一张整屏 Surface 上，
+新弹出的直接画在最上面，到期的只在它原来的矩形内（set_clip）按顺序重画与之相交的提示框，
+每帧再把整层贴到画面上一次，代价与每帧增减的提示数成正比，而不是与同时存在的提示数成正比。
+接口与 TipPopups 相同（step / update / close），另有 draw 把提示框画到画面上。
+"""
+from itertools import count
+
+import pygame
+
+from .popups import BG_COLORS, TIPS, WINDOW_HEIGHT, WINDOW_WIDTH
+
+# 依次尝试的中文字体（pygame.font.SysFont 的逗号分隔写法），都没有时退回默认字体
+FONT_NAMES = 'microsoftyahei,simhei,notosanscjksc,notosanscjk,wenquanyimicrohei,wenquanyizenhei'
+LIFETIME = (1000, 3000)  # 每个提示的显示时长范围（毫秒），与 TipPopups 相同
+WHEEL_TICK = 50  # 时间轮每格的毫秒数
+LAYER_DEPTH = 1.0  # 提示框总面积超过屏幕面积的这么多倍时改用提示层
+LAYER_KEY = (255, 0, 255)  # 提示层的透明色（提示框不会用到的颜色）
+
+
+class TimerWheel:
+    """分格的定时器：到期时间按 tick 毫秒取整后放进 (到期格 % 格数) 号格子
+    加入是一次 append；advance 只看上次推进以来经过的格子，与定时器总数无关。
+    到期时间超过一圈的条目留在格子里，转到它那一圈时才取出。
+    """
+    def __init__(self, tick=WHEEL_TICK, span=LIFETIME[1]):
+        self.tick = tick
+        self.slots = [[] for _ in range(span // tick + 2)]
+        self.current = None  # 已经处理到的格子编号（毫秒 // tick）
+        self.count = 0
+
+    def add(self, key, due):
+        """key 在 due 毫秒时到期"""
+        due = int(due // self.tick)
+        if self.current is not None:
+            due = max(due, self.current + 1)
+        self.slots[due % len(self.slots)].append((due, key))
+        self.count += 1
+
+    def advance(self, now):
+        """推进到 now 毫秒，返回到期的 key 列表"""
+        end = int(now // self.tick)
+        start = end if self.current is None else self.current + 1
+        self.current = end if self.current is None else max(end, self.current)
+        expired = []
+        slots = self.slots
+        for tick in range(max(start, end - len(slots) + 1), end + 1):
+            slot = slots[tick % len(slots)]
+            if not slot:
+                continue
+            later = [item for item in slot if item[0] > end]
+            if len(later) < len(slot):
+                expired.extend(key for due, key in slot if due <= end)
+                slots[tick % len(slots)] = later
+        self.count -= len(expired)
+        return expired
+
+
+class VirtualTips:
+    """画在 screen_size 大小画面上的提示框，rng 为 RandomStream（位置、文字、颜色、显示时长）
+    每隔 interval 毫秒弹出 burst 个，同时最多 max_visible 个，弹满 max_total 个为止；
+    某个提示到期后画面上一个都不剩时，显示最后一个居中的提示框（与 TipPopups 相同）。
+    alpha 为 0~255 时提示框半透明（混合的代价比不透明 blit 高；用提示层时整层一起半透明）。
+    """
+    def __init__(self, screen_size, rng, tips=TIPS, colors=BG_COLORS, interval=200, max_total=30,
+                 max_visible=8, burst=1, lifetime=LIFETIME, alpha=None):
+        self.width, self.height = screen_size
+        self.rng = rng
+        self.tips = tips
+        self.colors = colors
+        self.interval = interval
+        self.max_total = max_total
+        self.max_visible = max_visible
+        self.burst = burst
+        self.lifetime = lifetime
+        self.alpha = alpha
+        self.active = {}  # 编号 -> (提示框 Surface, 左上角)，按弹出顺序绘制，后弹出的在上面
+        self.wheel = TimerWheel(span=lifetime[1])
+        self.created = 0
+        self.final = None  # 最后的居中提示框 (Surface, 左上角)
+        self._boxes = {}  # (提示语, 颜色, 字号, 粗体) -> 渲染好的提示框
+        self._fonts = {}
+        self._ids = count()
+        self._last = 0
+        self._layer = None  # 提示层（提示框少时为 None，直接逐个 blit）
+        self._added = []  # 上次 draw 之后弹出的提示编号（只在使用提示层时记录）
+        self._removed = []  # 上次 draw 之后到期的提示框矩形（同上）
+
+    def _font(self, size, bold):
+        font = self._fonts.get((size, bold))
+        if font is None:
+            pygame.font.init()
+            font = self._fonts[size, bold] = pygame.font.SysFont(FONT_NAMES, size, bold)
+        return font
+
+    def box(self, text, colour, size=16, bold=False):
+        """(提示语, 颜色) 的提示框，第一次用到时渲染并缓存"""
+        key = (text, colour, size, bold)
+        surface = self._boxes.get(key)
+        if surface is None:
+            surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+            surface.fill(colour)
+            label = self._font(size, bold).render(text, True, (0, 0, 0))
+            surface.blit(label, label.get_rect(center=surface.get_rect().center))
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            if self.alpha is not None:
+                surface.set_alpha(self.alpha)
+            self._boxes[key] = surface
+        return surface
+
+    def step(self, now):
+        """主循环每帧调用，now 为毫秒时间戳：收回到期的提示，到了间隔就弹出新的"""
+        expired = self.wheel.advance(now)
+        for key in expired:
+            _, (x, y) = self.active.pop(key)
+            if self._layer is not None:
+                self._removed.append(pygame.Rect(x, y, WINDOW_WIDTH, WINDOW_HEIGHT))
+        if expired and not self.active and self.final is None:
+            self.create_final()
+        if now - self._last > self.interval:
+            self._last = now
+            for _ in range(self.burst):
+                self.create_tip(now)
+
+    def create_tip(self, now):
+        if (self.final is not None
+                or self.created >= self.max_total
+                or len(self.active) >= self.max_visible):
+            return
+        rng = self.rng
+        x = rng.randint(20, self.width - WINDOW_WIDTH - 20)
+        y = rng.randint(20, self.height - WINDOW_HEIGHT - 20)
+        key = next(self._ids)
+        self.active[key] = (self.box(rng.choice(self.tips), rng.choice(self.colors)), (x, y))
+        self.wheel.add(key, now + rng.randint(*self.lifetime))
+        self.created += 1
+        if self._layer is not None:
+            self._added.append(key)
+
+    def create_final(self):
+        x = (self.width - WINDOW_WIDTH) // 2
+        y = (self.height - WINDOW_HEIGHT) // 2
+        self.final = (self.box('我想你了', 'lightpink', 18, True), (x, y))
+
+    def draw(self, screen, dirty=None):
+        """把所有提示框画到 screen 上（提示框少时一次 blits，多时贴提示层）；dirty（DirtyRegion）记录画到的区域"""
+        width, height = screen.get_size()
+        if len(self.active) * WINDOW_WIDTH * WINDOW_HEIGHT > LAYER_DEPTH * width * height:
+            screen.blit(self._update_layer(screen.get_size()), (0, 0))
+        else:
+            self._layer = None
+            if self.active:
+                screen.blits(iter(self.active.values()), doreturn=False)
+        if self.final is not None:
+            screen.blit(*self.final)
+        if dirty is None:
+            return
+        shown = len(self.active) + (self.final is not None)
+        if shown * WINDOW_WIDTH * WINDOW_HEIGHT > dirty.full_ratio * dirty.width * dirty.height:
+            dirty.invalidate()  # 提示框多到超过整屏刷新的阈值，不必逐个记录
+            return
+        for _, (x, y) in self.active.values():
+            dirty.add_rect((x, y, WINDOW_WIDTH, WINDOW_HEIGHT))
+        if self.final is not None:
+            x, y = self.final[1]
+            dirty.add_rect((x, y, WINDOW_WIDTH, WINDOW_HEIGHT))
+
+    def _update_layer(self, size):
+        """把上次 draw 以来的增减应用到提示层上并返回它（第一次用到时整层合成）"""
+        layer = self._layer
+        if layer is None or layer.get_size() != size:
+            layer = self._layer = pygame.Surface(size).convert()
+            layer.set_colorkey(LAYER_KEY)
+            if self.alpha is not None:
+                layer.set_alpha(self.alpha)
+            layer.fill(LAYER_KEY)
+            layer.blits(iter(self.active.values()), doreturn=False)
+        else:
+            if self._removed:
+                boxes = list(self.active.values())
+                rects = [pygame.Rect(x, y, WINDOW_WIDTH, WINDOW_HEIGHT) for _, (x, y) in boxes]
+                for rect in self._removed:
+                    # 只在到期提示框的矩形内按原顺序重画与之相交的提示框
+                    layer.set_clip(rect)
+                    layer.fill(LAYER_KEY)
+                    layer.blits([boxes[i] for i in rect.collidelistall(rects)], doreturn=False)
+                layer.set_clip(None)
+            # 新弹出的提示框在最上面
+            layer.blits([self.active[key] for key in self._added if key in self.active], doreturn=False)
+        self._added.clear()
+        self._removed.clear()
+        return layer
+
+    def update(self):
+        """没有 Tk 事件需要处理（与 TipPopups 接口一致）"""
+
+    def close(self):
+        self.active.clear()
+        self._boxes.clear()
@@ -1,7 +1,9 @@
-import random
-from math import sin, cos, pi, log
 from tkinter import *
 
+import numpy as np
+
+from effects.heart_engine import HeartEngine, StreamedFrames, point_mask
+
 # 画布配置
 CANVAS_WIDTH = 840
 CANVAS_HEIGHT = 680
@@ -9,143 +11,106 @@ CANVAS_CENTER_X = CANVAS_WIDTH / 2
 CANVAS_CENTER_Y = CANVAS_HEIGHT / 2
 IMAGE_ENLARGE = 11  # 图像放大倍数
 HEART_COLOR = "pink"  # 心形颜色设置为粉红色
-
-def heart_function(t, shrink_ratio: float = IMAGE_ENLARGE):
-    """生成心形曲线上的点（基于参数方程）"""
-    x = 17 * (sin(t) ** 3)
-    y = -(16 * cos(t) - 5 * cos(2 * t) - 2 * cos(3 * t) - cos(4 * t))  # 修正原方程重复项
-    # 缩放并平移到画布中心
-    x *= shrink_ratio
-    y *= shrink_ratio
-    x += CANVAS_CENTER_X
-    y += CANVAS_CENTER_Y
-    return int(x), int(y)
-
-def scatter_inside(x, y, beta=0.15):
-    """在原始点周围生成扩散点（内部填充用）"""
-    ratio_x = -beta * log(random.random())
-    ratio_y = -beta * log(random.random())
-    dx = ratio_x * (x - CANVAS_CENTER_X)
-    dy = ratio_y * (y - CANVAS_CENTER_Y)
-    return x - dx, y - dy
-
-def shrink(x, y, ratio):
-    """收缩点坐标（用于光晕效果）"""
-    force = -1 / (((x - CANVAS_CENTER_X) **2 + (y - CANVAS_CENTER_Y)** 2) **0.6)
-    dx = ratio * force * (x - CANVAS_CENTER_X)
-    dy = ratio * force * (y - CANVAS_CENTER_Y)
-    return x - dx, y - dy
-
-def curve(p):
-    """动画曲线函数，控制心形收缩扩张节奏"""
-    return 2 * (2 * sin(4 * p)) / (2 * pi)
+RENDER_MODE = 'photo'  # 'items'：每帧删除重建矩形；'pool'：复用矩形对象；'photo'：整帧一张 PhotoImage
 
 class Heart:
-    """心形动画核心类，管理点集和帧数据"""
+    """心形动画核心类，管理帧数据（点集与逐帧计算交给向量化引擎）"""
     def __init__(self, generate_frame=20):
-        self._points = set()  # 原始心形点
-        self._edge_diffusion_points = set()  # 边缘扩散点
-        self._center_diffusion_points = set()  # 中心扩散点
-        self.all_points = {}  # 每帧的点数据
-        self.build(1000)  # 构建基础点集（优化：减少点数量）
+        self.engine = HeartEngine(
+            CANVAS_CENTER_X, CANVAS_CENTER_Y, IMAGE_ENLARGE,
+            edge_scatter=3, center_scatter=5000,
+            ratio_scale=15, period=10, halo_number=(1000, 2000),
+            viewport=(CANVAS_WIDTH, CANVAS_HEIGHT)  # 画布外的光晕点在计算时就剔除
+        )
         self.generate_frame = generate_frame  # 动画总帧数
-        # 预计算所有帧的点数据
-        for frame in range(generate_frame):
-            self.calc(frame)
-
-    def build(self, number):
-        """构建基础点集（原始点+扩散点）"""
-        # 生成原始心形点
-        for _ in range(number):
-            t = random.uniform(0, 2 * pi)
-            x, y = heart_function(t)
-            self._points.add((x, y))
-        
-        # 生成边缘扩散点
-        for _x, _y in list(self._points):
-            for _ in range(3):
-                x, y = scatter_inside(_x, _y, 0.05)
-                self._edge_diffusion_points.add((x, y))
-        
-        # 生成中心扩散点（优化：减少点数量）
-        point_list = list(self._points)
-        for _ in range(5000):
-            x, y = random.choice(point_list)
-            x, y = scatter_inside(x, y, 0.27)
-            self._center_diffusion_points.add((x, y))
-
-    @staticmethod
-    def calc_position(x, y, ratio):
-        """计算动态点位置（带随机扰动）"""
-        force = 1 / (((x - CANVAS_CENTER_X)** 2 + (y - CANVAS_CENTER_Y) **2)** 0.420)
-        dx = ratio * force * (x - CANVAS_CENTER_X) + random.randint(-1, 1)
-        dy = ratio * force * (y - CANVAS_CENTER_Y) + random.randint(-1, 1)
-        return x - dx, y - dy
-
-    def calc(self, generate_frame):
-        """计算指定帧的所有点数据（包括光晕）"""
-        ratio = 15 * curve(generate_frame / 10 * pi)
-        halo_radius = int(4 + 6 * (1 + curve(generate_frame / 10 * pi)))
-        # 优化：减少光晕点数量
-        halo_number = int(1000 + 2000 * abs(curve(generate_frame / 10 * pi)** 2))
-        all_points = []
-
-        # 生成光晕点
-        heart_halo_point = set()
-        for _ in range(halo_number):
-            t = random.uniform(0, 2 * pi)
-            x, y = heart_function(t, shrink_ratio=-15)
-            x, y = shrink(x, y, halo_radius)
-            if (x, y) not in heart_halo_point:
-                heart_halo_point.add((x, y))
-                x += random.randint(-60, 60)
-                y += random.randint(-60, 60)
-                size = random.choice((1, 1, 2))
-                # 添加光晕点及其偏移点
-                all_points.extend([
-                    (x, y, size),
-                    (x + 20, y + 20, size),
-                    (x - 20, y - 20, size),
-                    (x + 20, y - 20, size),
-                    (x - 20, y + 20, size)
-                ])
-        
-        # 添加原始点
-        for x, y in self._points:
-            x, y = self.calc_position(x, y, ratio)
-            size = random.randint(1, 3)
-            all_points.append((x, y, size))
-        
-        # 添加边缘扩散点
-        for x, y in self._edge_diffusion_points:
-            x, y = self.calc_position(x, y, ratio)
-            size = random.randint(1, 2)
-            all_points.append((x, y, size))
-        
-        # 添加中心扩散点
-        for x, y in self._center_diffusion_points:
-            x, y = self.calc_position(x, y, ratio)
-            size = random.randint(1, 2)
-            all_points.append((x, y, size))
-        
-        self.all_points[generate_frame] = all_points
+        # 每帧的点数据：第 0 帧立即算好，其余帧由后台线程生成（未完成时显示最近的已完成帧）
+        self.all_points = StreamedFrames(self.engine, 1000, generate_frame)
 
     def render(self, render_canvas, render_frame):
         """渲染指定帧的所有点"""
-        for x, y, size in self.all_points[render_frame % self.generate_frame]:
+        for x, y, size in self.all_points[render_frame % self.generate_frame].tolist():
             render_canvas.create_rectangle(
                 x, y, x + size, y + size,
                 width=0, fill=HEART_COLOR
             )
 
-def draw(main: Tk, render_canvas: Canvas, render_heart: Heart, render_frame=0):
-    """动画绘制循环"""
-    render_canvas.delete('all')  # 清空画布
-    render_heart.render(render_canvas, render_frame)  # 渲染当前帧
+class ItemRenderer:
+    """原始方式：每帧清空画布并重新创建所有矩形"""
+    def __init__(self, render_canvas, render_heart):
+        self.canvas = render_canvas
+        self.heart = render_heart
+
+    def render(self, render_frame):
+        self.canvas.delete('all')  # 清空画布
+        self.heart.render(self.canvas, render_frame)
+
+
+class PoolRenderer:
+    """矩形对象池：矩形只在点数增加时补建，之后每帧只用 coords 移动、用 state 显隐"""
+    def __init__(self, render_canvas, render_heart):
+        self.canvas = render_canvas
+        self.heart = render_heart
+        self.items = []
+        self.visible = 0  # 当前显示的矩形数（items 中前 visible 个）
+
+    def render(self, render_frame):
+        points = self.heart.all_points[render_frame % self.heart.generate_frame].tolist()
+        canvas = self.canvas
+        while len(self.items) < len(points):
+            self.items.append(canvas.create_rectangle(
+                0, 0, 0, 0, width=0, fill=HEART_COLOR, state='hidden'
+            ))
+        # 直接调用 Tcl 命令，省去 Canvas.coords 对返回值的解析
+        call, path = canvas.tk.call, str(canvas)
+        for item, (x, y, size) in zip(self.items, points):
+            call(path, 'coords', item, x, y, x + size, y + size)
+        # 只切换显隐状态发生变化的那部分矩形
+        count = len(points)
+        for item in self.items[self.visible:count]:
+            call(path, 'itemconfigure', item, '-state', 'normal')
+        for item in self.items[count:self.visible]:
+            call(path, 'itemconfigure', item, '-state', 'hidden')
+        self.visible = count
+
+
+class PhotoRenderer:
+    """整帧光栅化：每帧的点只画一次到 PhotoImage，之后每帧只切换画布上唯一图片对象的 image"""
+    def __init__(self, render_canvas, render_heart):
+        self.canvas = render_canvas
+        self.heart = render_heart
+        self.colour = np.array([c >> 8 for c in render_canvas.winfo_rgb(HEART_COLOR)], dtype=np.uint8)
+        self.images = {}  # id(帧数组) -> (帧数组, PhotoImage)，保留帧数组引用以免 id 被复用
+        self.item = render_canvas.create_image(0, 0, anchor=NW)
+
+    def _photo(self, points):
+        mask = point_mask(points, 0, 0, CANVAS_WIDTH, CANVAS_HEIGHT)
+        rgb = np.zeros((CANVAS_HEIGHT, CANVAS_WIDTH, 3), dtype=np.uint8)  # 黑色背景，与画布一致
+        rgb[mask.T] = self.colour
+        header = f'P6 {CANVAS_WIDTH} {CANVAS_HEIGHT} 255\n'.encode()
+        return PhotoImage(master=self.canvas, data=header + rgb.tobytes(), format='PPM')
+
+    def render(self, render_frame):
+        points = self.heart.all_points[render_frame % self.heart.generate_frame]
+        entry = self.images.get(id(points))
+        if entry is None:
+            entry = (points, self._photo(points))
+            self.images[id(points)] = entry
+        self.canvas.itemconfigure(self.item, image=entry[1])
+
+
+RENDERERS = {'items': ItemRenderer, 'pool': PoolRenderer, 'photo': PhotoRenderer}
+
+def draw(main: Tk, renderer, render_frame=0, frames=None):
+    """动画绘制循环（给出 frames 时画完这么多帧就关闭窗口）"""
+    if frames is not None and render_frame >= frames:
+        main.destroy()
+        return
+    renderer.render(render_frame)  # 渲染当前帧
     # 控制帧率（优化：16ms/帧 ~60帧/秒）
-    main.after(16, draw, main, render_canvas, render_heart, render_frame + 1)
+    main.after(16, draw, main, renderer, render_frame + 1, frames)
 
-if __name__ == '__main__':
+def main(frames=None):
+    """运行动画；给出 frames 时画完这么多帧就退出（测量启动耗时用）"""
     # 初始化窗口和画布
     root = Tk()
     root.title("动态心形")  # 添加窗口标题
@@ -154,5 +119,9 @@ if __name__ == '__main__':
     
     # 启动动画
     heart = Heart()
-    draw(root, canvas, heart)
-    root.mainloop()
\ No newline at end of file
+    draw(root, RENDERERS[RENDER_MODE](canvas, heart), frames=frames)
+    root.mainloop()
+
+
+if __name__ == '__main__':
+    main()
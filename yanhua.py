@@ -1,208 +1,55 @@
-import pygame 
-from random import randint, uniform, choice
-import math
+import pygame
+from effects.display import close_window, open_window
+from effects.dirty_rects import DirtyRegion
+from effects.fireworks import FireworkShow
+from effects.rng_streams import RandomStreams
 
-vector = pygame.math.Vector2
-gravity = vector(0, 0.3)
 DISPLAY_WIDTH = DISPLAY_HEIGHT = 800
- 
-trail_colours = [(45, 45, 45), (60, 60, 60), (75, 75, 75),
-                 (125, 125, 125), (150, 150, 150)]
-dynamic_offset = 1
-static_offset = 5
- 
- 
-class Firework:
- 
-    def __init__(self):
-        self.colour = (randint(0, 255), randint(0, 255), randint(0, 255))
-        self.colours = (
-            (randint(0, 255), randint(0, 255), randint(0, 255)),
-            (randint(0, 255), randint(0, 255), randint(0, 255)),
-            (randint(0, 255), randint(0, 255), randint(0, 255))
-        )
-        self.firework = Particle(randint(0, DISPLAY_WIDTH), DISPLAY_HEIGHT, True, self.colour)
-        self.exploded = False
-        self.particles = []
-        self.min_max_particles = (100, 225)  # 修正：改为整数元组
- 
-    def update(self, win):
-        if not self.exploded:
-            self.firework.apply_force(gravity)
-            self.firework.move()
-            for tf in self.firework.trails:
-                tf.show(win)
-            self.show(win)
-            if self.firework.vel.y >= 0:
-                self.exploded = True
-                self.explode()
-        else:
-            for particle in self.particles:
-                particle.apply_force(
-                    vector(gravity.x + uniform(-1, 1) / 20, gravity.y / 2 + (randint(1, 8) / 100))
-                )
-                particle.move()
-                for t in particle.trails:
-                    t.show(win)
-                particle.show(win)
- 
-    def explode(self):
-        # 修正：使用元组索引获取整数
-        amount = randint(self.min_max_particles[0], self.min_max_particles[1])
-        for i in range(amount):
-            self.particles.append(Particle(self.firework.pos.x, self.firework.pos.y, False, self.colours))
- 
-    def show(self, win):
-        pygame.draw.circle(win, self.colour, 
-                          (int(self.firework.pos.x), int(self.firework.pos.y)), 
-                          self.firework.size)
- 
-    def remove(self):
-        if self.exploded:
-            for p in self.particles:
-                if p.remove:
-                    self.particles.remove(p)
-            return len(self.particles) == 0
-        return False
- 
- 
-class Particle:
- 
-    def __init__(self, x, y, firework, colour):
-        self.firework = firework
-        self.pos = vector(x, y)
-        self.origin = vector(x, y)
-        self.radius = 20
-        self.remove = False
-        self.explosion_radius = randint(5, 18)
-        self.life = 0
-        self.acc = vector(0, 0)
-        self.trails = []
-        self.prev_posx = [-10] * 10
-        self.prev_posy = [-10] * 10
- 
-        if self.firework:
-            self.vel = vector(0, -randint(17, 20))
-            self.size = 5
-            self.colour = colour
-            for i in range(5):
-                self.trails.append(Trail(i, self.size, True))
-        else:
-            self.vel = vector(uniform(-1, 1), uniform(-1, 1))
-            self.vel.x *= randint(7, self.explosion_radius + 2)
-            self.vel.y *= randint(7, self.explosion_radius + 2)
-            self.size = randint(2, 4)
-            self.colour = choice(colour)
-            for i in range(5):
-                self.trails.append(Trail(i, self.size, False))
- 
-    def apply_force(self, force):
-        self.acc += force
- 
-    def move(self):
-        if not self.firework:
-            self.vel.x *= 0.8
-            self.vel.y *= 0.8
-        self.vel += self.acc
-        self.pos += self.vel
-        self.acc *= 0
- 
-        if self.life == 0 and not self.firework:
-            distance = math.sqrt((self.pos.x - self.origin.x)**2 + (self.pos.y - self.origin.y)** 2)
-            if distance > self.explosion_radius:
-                self.remove = True
- 
-        self.decay()
-        self.trail_update()
-        self.life += 1
- 
-    def show(self, win):
-        pygame.draw.circle(win, self.colour, 
-                          (int(self.pos.x), int(self.pos.y)), 
-                          self.size)
- 
-    def decay(self):
-        if 50 > self.life > 10:
-            ran = randint(0, 30)
-            if ran == 0:
-                self.remove = True
-        elif self.life > 50:
-            ran = randint(0, 5)
-            if ran == 0:
-                self.remove = True
- 
-    def trail_update(self):
-        self.prev_posx.pop()
-        self.prev_posx.insert(0, int(self.pos.x))
-        self.prev_posy.pop()
-        self.prev_posy.insert(0, int(self.pos.y))
- 
-        for n, t in enumerate(self.trails):
-            if t.dynamic:
-                t.get_pos(self.prev_posx[n + dynamic_offset], self.prev_posy[n + dynamic_offset])
-            else:
-                t.get_pos(self.prev_posx[n + static_offset], self.prev_posy[n + static_offset])
- 
- 
-class Trail:
- 
-    def __init__(self, n, size, dynamic):
-        self.pos_in_line = n
-        self.pos = vector(-10, -10)
-        self.dynamic = dynamic
- 
-        if self.dynamic:
-            self.colour = trail_colours[n]
-            self.size = int(size - n / 2)
-        else:
-            self.colour = (255, 255, 200)
-            self.size = size - 2
-            if self.size < 0:
-                self.size = 0
- 
-    def get_pos(self, x, y):
-        self.pos = vector(x, y)
- 
-    def show(self, win):
-        pygame.draw.circle(win, self.colour, 
-                          (int(self.pos.x), int(self.pos.y)), 
-                          self.size)
- 
- 
-def update(win, fireworks):
-    for fw in fireworks:
-        fw.update(win)
-        if fw.remove():
-            fireworks.remove(fw)
-    pygame.display.update()
- 
- 
-def main():
-    pygame.init()
-    pygame.display.set_caption("Fireworks in Pygame")
-    win = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+DIRTY_RECTS = True  # 只清除、刷新烟花画到的区域（面积大时自动整屏刷新）
+BACKGROUND_COLOR = (20, 20, 30)
+FIREWORK_SPRITES = True  # 粒子用缓存的圆点精灵批量 blit（False：逐个 draw.circle）
+FIREWORK_TRAILS = 'circles'  # 'circles'：每个粒子画 5 个拖尾圆点；'fade'：粒子只画一次到渐隐层上留下残影
+FIREWORK_SEED = None  # 随机种子（设为整数则每次运行的烟花完全相同）
+
+# 烟花样式（粒子更少、更小）
+FIREWORK_STYLE = {
+    'particles': (100, 225),
+    'explosion_radius': (5, 18),
+    'spread_min': 7,
+    'launch_speed': (17, 20),
+    'shell_size': 5,
+    'particle_size': (2, 4),
+}
+
+
+def main(frames=None):
+    """运行烟花；给出 frames 时画完这么多帧就退出（测量启动耗时用）"""
+    win = open_window((DISPLAY_WIDTH, DISPLAY_HEIGHT), "Fireworks in Pygame")
     clock = pygame.time.Clock()
- 
-    fireworks = [Firework() for _ in range(2)]
+    show = FireworkShow(win.get_size(), FIREWORK_STYLE, RandomStreams(FIREWORK_SEED),
+                        launch_chance=21, initial=2, sprites=FIREWORK_SPRITES,
+                        trails=FIREWORK_TRAILS, culling=False)
+    dirty = DirtyRegion(win.get_size(), DIRTY_RECTS)
+    frame = 0
     running = True
- 
-    while running:
+
+    while running and (frames is None or frame < frames):
         clock.tick(60)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_1:
-                    fireworks.append(Firework())
+                    show.launch()
                 if event.key == pygame.K_2:
-                    for _ in range(10):
-                        fireworks.append(Firework())
-        win.fill((20, 20, 30))
-        if randint(0, 20) == 1:
-            fireworks.append(Firework())
-        update(win, fireworks)
-    pygame.quit()
-    quit()
- 
- 
-main()
\ No newline at end of file
+                    show.launch(10)
+        dirty.clear(win, BACKGROUND_COLOR)
+        show.roll_launch()
+        show.update(win, dirty)
+        dirty.update()
+        frame += 1
+    close_window()
+
+
+if __name__ == "__main__":
+    main()